@@ -0,0 +1,46 @@
+from analisador_semantico.semantic import SemanticAnalyzer
+
+class IncrementalSemanticAnalyzer:
+    """Análise semântica de um programa que é reanalisado a cada edição.
+
+    O resultado de uma instrução depende de todas as anteriores (o que já foi
+    declarado, a ordem das entradas da tabela, os erros de redeclaração), então
+    reaproveitar instruções soltas não dá a tabela de uma análise completa.
+    Quando o corpo do programa muda, a análise é refeita inteira sobre a mesma
+    tabela (reset() mantém os mesmos dicionários); quando não muda — mesmas
+    instruções, seja o mesmo objeto, como as reaproveitadas por
+    Parser.parse_incremental, seja o mesmo conteúdo —, o resultado anterior é
+    devolvido sem reanalisar nada.
+
+    As instruções reaproveitadas não podem ter sido alteradas no lugar."""
+
+    def __init__(self):
+        self.analyzer = SemanticAnalyzer()
+        self.symbols = self.analyzer.symbols
+        self.symbol_table = self.analyzer.symbol_table
+        self.errors = self.analyzer.errors
+        self.statements = None
+
+    def analyze(self, ast):
+        """Analisa `ast` e retorna (tabela_de_símbolos, estatísticas), onde as
+        estatísticas trazem quantas instruções foram revalidadas ("rechecked")
+        e quantas tiveram o resultado anterior reaproveitado ("reused")."""
+        body = ast["body"] if ast["type"] == "Program" else None
+        if body is not None and self.statements is not None and _same_statements(body, self.statements):
+            return self.symbol_table, {"statements": len(body), "rechecked": 0, "reused": len(body)}
+
+        self.analyzer.reset()
+        self.analyzer.analyze(ast)
+        self.errors = self.analyzer.errors
+        self.statements = list(body) if body is not None else None
+        count = len(body) if body is not None else 0
+        return self.symbol_table, {"statements": count, "rechecked": count, "reused": 0}
+
+
+def _same_statements(body, previous):
+    if len(body) != len(previous):
+        return False
+    for statement, old in zip(body, previous):
+        if statement is not old and statement != old:
+            return False
+    return True
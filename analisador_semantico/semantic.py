@@ -1,10 +1,36 @@
 import json
+from analisador_semantico.symbol_table import SymbolTable, click_event, keypress_event
 
 class SemanticAnalyzer:
     def __init__(self):
-        self.symbol_table = {"elements": {}, "events": {}, "variables": {}}
+        self.symbols = SymbolTable()
+        # Dicionário exportado (o mesmo objeto de self.symbols.data)
+        self.symbol_table = self.symbols.data
         self.window_created = False
         self.errors = []
+        # Evento cujas ações estão sendo analisadas (para os índices de uso)
+        self.current_event = None
+
+        self.statement_handlers = {
+            "createWindow": self.analyze_create_window,
+            "addElement": self.analyze_add_element,
+            "variable_assignment": self.analyze_variable_assignment,
+            "onClick": self.analyze_on_click,
+            "onKeypress": self.analyze_on_keypress,
+        }
+        self.action_handlers = {
+            "setProperty": self.analyze_set_property,
+            "variable_assignment": self.analyze_variable_assignment,
+            "shiftElement": self.analyze_shift_element,
+        }
+
+    def reset(self):
+        """Descarta o resultado da última análise; a tabela é esvaziada no
+        lugar, então self.symbol_table continua sendo o mesmo dicionário."""
+        self.symbols.reset()
+        self.window_created = False
+        self.errors = []
+        self.current_event = None
 
     def analyze(self, ast):
         """Analisa o programa a partir do AST."""
@@ -23,19 +49,11 @@ class SemanticAnalyzer:
     def analyze_statement(self, statement):
         """Analisa cada declaração."""
         statement_type = statement["type"]
-
-        if statement_type == "createWindow":
-            self.analyze_create_window(statement)
-        elif statement_type == "addElement":
-            self.analyze_add_element(statement)
-        elif statement_type == "variable_assignment":
-            self.analyze_variable_assignment(statement)
-        elif statement_type == "onClick":
-            self.analyze_on_click(statement)
-        elif statement_type == "onKeypress":
-            self.analyze_on_keypress(statement)
-        else:
+        handler = self.statement_handlers.get(statement_type)
+        if handler is None:
             self.errors.append(f"Tipo de declaração desconhecido: {statement_type}")
+        else:
+            handler(statement)
 
     def analyze_create_window(self, statement):
         """Analisa a declaração de criação de janela."""
@@ -50,11 +68,7 @@ class SemanticAnalyzer:
 
         if isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0:
             self.window_created = True
-            self.symbol_table["window"] = {
-                "title": title,
-                "width": width,
-                "height": height
-            }
+            self.symbols.set_window(title, width, height)
         else:
             self.errors.append(
                 "Erro semântico: 'width' e 'height' devem ser números inteiros positivos.")
@@ -69,7 +83,7 @@ class SemanticAnalyzer:
         element_id = attributes.get("id", "").strip("\"")
 
         if not element_id and element_type == "button":
-            element_id = f"button_{len(self.symbol_table['elements']) + 1}"
+            element_id = f"button_{len(self.symbols.elements) + 1}"
 
         if not element_type or x is None or y is None:
             self.errors.append("Erro semântico: 'addElement' deve especificar 'type', 'x' e 'y'.")
@@ -79,14 +93,10 @@ class SemanticAnalyzer:
             self.errors.append("Erro semântico: 'x' e 'y' devem ser números inteiros.")
             return
 
-        if element_id in self.symbol_table["elements"]:
+        if self.symbols.has_element(element_id):
             self.errors.append(f"Erro semântico: o elemento '{element_id}' já foi declarado.")
         else:
-            self.symbol_table["elements"][element_id] = {
-                "type": element_type,
-                "attributes": attributes,
-                "actions": []
-            }
+            self.symbols.declare_element(element_id, element_type, attributes)
 
     def analyze_variable_assignment(self, statement):
         """Analisa a atribuição de variável."""
@@ -99,10 +109,7 @@ class SemanticAnalyzer:
         if var_value["type"] not in ["string", "number"]:
             self.errors.append(f"Erro semântico: tipo inválido para a variável '{var_name}'.")
         else:
-            self.symbol_table["variables"][var_name] = {
-                "type": var_value["type"],
-                "value": var_value["value"]
-            }
+            self.symbols.set_variable(var_name, var_value["type"], var_value["value"])
 
     def analyze_function_call(self, function_call):
         """Analisa chamadas de função."""
@@ -117,7 +124,9 @@ class SemanticAnalyzer:
             return
 
         element_id = arguments[0].strip("\"")
-        if element_id not in self.symbol_table["elements"]:
+        if self.current_event is not None:
+            self.symbols.record_element_use(element_id, self.current_event)
+        if not self.symbols.has_element(element_id):
             self.errors.append(f"Erro semântico: o elemento '{element_id}' não foi declarado.")
 
     def analyze_on_click(self, statement):
@@ -125,70 +134,49 @@ class SemanticAnalyzer:
         target = statement["target"].strip("\"")
         
         if target == "button":
-            button_elements = [
-                btn_id for btn_id, btn_info in self.symbol_table["elements"].items() 
-                if btn_info["type"] == "button"
-            ]
-            if not button_elements:
+            target = self.symbols.first_of_type("button")
+            if target is None:
                 self.errors.append(f"Erro semântico: nenhum botão foi declarado.")
                 return
-            target = button_elements[0]
 
-        if target not in self.symbol_table["elements"]:
+        if not self.symbols.has_element(target):
             self.errors.append(f"Erro semântico: o botão '{target}' não foi declarado.")
             return
 
-        if "events" not in self.symbol_table:
-            self.symbol_table["events"] = {}
-
-        if target not in self.symbol_table["events"]:
-            self.symbol_table["events"][target] = {
-                "type": "onClick",
-                "actions": []
-            }
-
-        for action in statement["actions"]:
-            self.analyze_action(action)
-            self.symbol_table["events"][target]["actions"].append(action)
+        handler = self.symbols.click_handler(target)
+        self._analyze_actions(statement["actions"], handler, click_event(target))
 
     def analyze_on_keypress(self, statement):
         """Analisa eventos onKeypress."""
         key = statement["key"].strip("\"")
-        
-        if "events" not in self.symbol_table:
-            self.symbol_table["events"] = {}
-
-        if "keypress" not in self.symbol_table["events"]:
-            self.symbol_table["events"]["keypress"] = {}
-
-        if key not in self.symbol_table["events"]["keypress"]:
-            self.symbol_table["events"]["keypress"][key] = {
-                "type": "onKeypress",
-                "actions": []
-            }
-
-        for action in statement["actions"]:
-            self.analyze_action(action)
-            self.symbol_table["events"]["keypress"][key]["actions"].append(action)
+        handler = self.symbols.keypress_handler(key)
+        self._analyze_actions(statement["actions"], handler, keypress_event(key))
+
+    def _analyze_actions(self, actions, handler, event):
+        self.current_event = event
+        try:
+            for action in actions:
+                self.analyze_action(action)
+                handler["actions"].append(action)
+        finally:
+            self.current_event = None
 
     def analyze_action(self, action):
         """Analisa ações dentro de eventos."""
         action_type = action["type"]
-
-        if action_type == "setProperty":
-            self.analyze_set_property(action)
-        elif action_type == "variable_assignment":
-            self.analyze_variable_assignment(action)
-        elif action_type == "shiftElement":
-            self.analyze_shift_element(action)
-        else:
+        handler = self.action_handlers.get(action_type)
+        if handler is None:
             self.errors.append(f"Erro semântico: ação desconhecida '{action_type}'.")
+        else:
+            handler(action)
 
     def analyze_shift_element(self, statement):
         """Analisa a ação de deslocar um elemento."""
         element_id = statement["element_id"].strip("\"")
+        if self.current_event is not None:
+            self.symbols.record_variable_use(element_id, self.current_event)
         
-        if element_id not in self.symbol_table["variables"]:
+        if element_id not in self.symbols.variables:
             self.errors.append(f"Erro semântico: o elemento '{element_id}' não foi declarado como variável.")
         
         x = statement.get("x", 0)
@@ -200,11 +188,17 @@ class SemanticAnalyzer:
     def analyze_set_property(self, statement):
         """Analisa setProperty."""
         element_id = statement["element_id"].strip("\"")
-        if element_id not in self.symbol_table["elements"]:
+        expression = statement.get("expression", [])
+        if self.current_event is not None:
+            self.symbols.record_element_use(element_id, self.current_event)
+            # Partes da expressão que começam com letra são nomes de variáveis
+            for part in expression:
+                if part[:1].isalpha():
+                    self.symbols.record_variable_use(part, self.current_event)
+        if not self.symbols.has_element(element_id):
             self.errors.append(f"Erro semântico: o elemento '{element_id}' não foi declarado.")
         else:
-            expression = statement.get("expression", [])
-            self.symbol_table["elements"][element_id]["last_set_property"] = expression
+            self.symbols.elements[element_id]["last_set_property"] = expression
 
     def report_errors(self):
         """Exibe erros encontrados."""
@@ -216,15 +210,25 @@ class SemanticAnalyzer:
             print("Análise semântica concluída sem erros.")
 
 
-def load_ast_from_file(file_path):
+def load_ast_from_file(file_path, typed=False):
+    """Carrega uma AST salva em JSON (indentado ou compacto) ou no formato
+    binário de utils.artifacts; com typed=True devolve os nós de parser.ast_nodes."""
+    from utils.artifacts import loads_artifact, MARSHAL_MAGIC
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            ast = json.load(file)
-        return ast
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        if typed:
+            from parser.ast_nodes import typed_object_hook, node_from_dict
+            if data.startswith(MARSHAL_MAGIC):
+                return node_from_dict(loads_artifact(data))
+            return json.loads(data, object_hook=typed_object_hook)
+        return loads_artifact(data)
     except FileNotFoundError:
         print(f"Erro: Arquivo {file_path} não encontrado.")
     except json.JSONDecodeError as e:
         print(f"Erro ao decodificar o JSON: {e}")
+    except (ValueError, EOFError) as e:
+        print(f"Erro ao decodificar o artefato: {e}")
     return None
 
 # file_path = "../output-codigo_loop.simpleui.json"
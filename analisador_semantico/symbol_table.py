@@ -0,0 +1,99 @@
+ELEMENT_TYPES = ("button", "input", "label")
+
+def click_event(target):
+    return ("onClick", target)
+
+def keypress_event(key):
+    return ("onKeypress", key)
+
+
+class SymbolTable:
+    """Tabela de símbolos da análise semântica.
+
+    `data` é o dicionário exportado (mesmo formato de sempre: "elements",
+    "events", "variables" e, se houver janela, "window"). Em volta dele ficam
+    índices mantidos a cada inserção:
+
+    - by_type: tipo de elemento -> ids, na ordem de declaração;
+    - element_events: id do elemento -> eventos cujas ações o usam;
+    - variable_uses: nome da variável -> eventos cujas ações a usam.
+
+    Os eventos são identificados por ("onClick", alvo) ou ("onKeypress", tecla)."""
+
+    def __init__(self):
+        self.data = {"elements": {}, "events": {}, "variables": {}}
+        # Dicionários com valor None fazem papel de conjuntos ordenados
+        self.by_type = {element_type: {} for element_type in ELEMENT_TYPES}
+        self.element_events = {}
+        self.variable_uses = {}
+
+    def reset(self):
+        """Volta ao estado de uma tabela nova, mantendo os mesmos objetos de
+        `data` e dos índices."""
+        self.data.pop("window", None)
+        for section in ("elements", "events", "variables"):
+            self.data[section].clear()
+        self.by_type.clear()
+        for element_type in ELEMENT_TYPES:
+            self.by_type[element_type] = {}
+        self.element_events.clear()
+        self.variable_uses.clear()
+
+    @property
+    def elements(self):
+        return self.data["elements"]
+
+    @property
+    def events(self):
+        return self.data["events"]
+
+    @property
+    def variables(self):
+        return self.data["variables"]
+
+    def to_dict(self):
+        return self.data
+
+    def set_window(self, title, width, height):
+        self.data["window"] = {"title": title, "width": width, "height": height}
+
+    def has_element(self, element_id):
+        return element_id in self.data["elements"]
+
+    def declare_element(self, element_id, element_type, attributes):
+        self.data["elements"][element_id] = {"type": element_type, "attributes": attributes, "actions": []}
+        self.by_type.setdefault(element_type, {})[element_id] = None
+
+    def elements_of_type(self, element_type):
+        return list(self.by_type.get(element_type, ()))
+
+    def first_of_type(self, element_type):
+        return next(iter(self.by_type.get(element_type, ())), None)
+
+    def set_variable(self, name, value_type, value):
+        self.data["variables"][name] = {"type": value_type, "value": value}
+
+    def click_handler(self, target):
+        """Entrada de events para o onClick de `target`, criada se preciso."""
+        events = self.data["events"]
+        if target not in events:
+            events[target] = {"type": "onClick", "actions": []}
+        return events[target]
+
+    def keypress_handler(self, key):
+        keypress = self.data["events"].setdefault("keypress", {})
+        if key not in keypress:
+            keypress[key] = {"type": "onKeypress", "actions": []}
+        return keypress[key]
+
+    def record_element_use(self, element_id, event):
+        self.element_events.setdefault(element_id, {})[event] = None
+
+    def record_variable_use(self, name, event):
+        self.variable_uses.setdefault(name, {})[event] = None
+
+    def events_using_element(self, element_id):
+        return list(self.element_events.get(element_id, ()))
+
+    def events_using_variable(self, name):
+        return list(self.variable_uses.get(name, ()))
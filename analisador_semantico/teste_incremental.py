@@ -0,0 +1,102 @@
+"""Teste diferencial de IncrementalSemanticAnalyzer: aplica uma sequência
+de edições aleatórias ao corpo de um programa (remover, inserir — às vezes
+o mesmo objeto de instrução, como faz Parser.parse_incremental —, trocar
+de lugar, substituir, nada) e compara, a cada passo, tabela de símbolos, índices
+e erros com os de uma análise completa do SemanticAnalyzer.
+
+    python -m analisador_semantico.teste_incremental [--edits N] [--seed S]
+"""
+
+import copy
+import glob
+import json
+import os
+import random
+from benchmarks.workload import WorkloadParams, generate_program
+from lexer.lexer import lexer
+from parser.parser import Parser
+from analisador_semantico.semantic import SemanticAnalyzer
+from analisador_semantico.incremental import IncrementalSemanticAnalyzer
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testes')
+
+# Instruções que os programas gerados e os de testes/ não têm: um elemento de
+# tipo fora de ELEMENT_TYPES (cria uma chave nova em SymbolTable.by_type).
+EXTRA_STATEMENTS = '''
+addElement(type="slider", id="volume", x=10, y=10);
+addElement(type="slider", id="brilho", x=10, y=40);
+'''
+
+def _statement_pool(body):
+    """Instruções usadas nas inserções: as de `body` e as dos programas de testes/."""
+    pool = list(body) + Parser(lexer(EXTRA_STATEMENTS)).parse()["body"]
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, '*.simpleui'))):
+        with open(path, encoding='utf-8') as file:
+            try:
+                pool += Parser(lexer(file.read())).parse()["body"]
+            except (SyntaxError, ValueError):
+                continue
+    return pool
+
+def _edit(rng, body, pool):
+    operation = rng.random()
+    if operation < 0.3 and body:
+        del body[rng.randrange(len(body))]
+    elif operation < 0.6:
+        statement = rng.choice(pool)
+        body.insert(rng.randrange(len(body) + 1), statement if rng.random() < 0.7 else copy.deepcopy(statement))
+    elif operation < 0.8 and len(body) > 1:
+        i, j = rng.randrange(len(body)), rng.randrange(len(body))
+        body[i], body[j] = body[j], body[i]
+    elif operation < 0.95 and body:
+        body[rng.randrange(len(body))] = copy.deepcopy(rng.choice(pool))
+    # Nas demais, o programa fica como estava
+
+def check(edits=1500, seed=0):
+    """Retorna (edições comparadas, instruções revalidadas, divergências),
+    onde cada divergência é (passo, descrição)."""
+    rng = random.Random(seed)
+    code = generate_program(WorkloadParams(elements=30, click_handlers=6, keypress_handlers=3, variables=10, seed=seed))
+    body = Parser(lexer(code)).parse()["body"]
+    pool = _statement_pool(body)
+    incremental = IncrementalSemanticAnalyzer()
+    rechecked = 0
+    mismatches = []
+    for step in range(edits):
+        _edit(rng, body, pool)
+        ast = {"type": "Program", "body": list(body)}
+        full = SemanticAnalyzer()
+        expected = full.analyze(ast)
+        try:
+            got, stats = incremental.analyze(ast)
+        except Exception as e:
+            # O estado guardado pode ter ficado inconsistente: recomeça do zero
+            mismatches.append((step, f"exceção: {type(e).__name__}: {e}"))
+            incremental = IncrementalSemanticAnalyzer()
+            continue
+        rechecked += stats["rechecked"]
+        # json.dumps também compara a ordem das entradas
+        if json.dumps(got) != json.dumps(expected):
+            mismatches.append((step, "tabela de símbolos"))
+        elif incremental.errors != full.errors:
+            mismatches.append((step, f"erros: {incremental.errors} != {full.errors}"))
+        elif (incremental.symbols.by_type != full.symbols.by_type
+              or incremental.symbols.element_events != full.symbols.element_events
+              or incremental.symbols.variable_uses != full.symbols.variable_uses):
+            mismatches.append((step, "índices da tabela"))
+    return edits, rechecked, mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compara a análise semântica incremental com a completa")
+    arg_parser.add_argument('--edits', type=int, default=1500)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    checked, rechecked, mismatches = check(args.edits, args.seed)
+    for step, description in mismatches[:3]:
+        print(f"Divergência no passo {step}: {description}")
+    print(f"{checked} edições comparadas ({rechecked} instruções revalidadas), {len(mismatches)} divergências")
+    raise SystemExit(1 if mismatches else 0)
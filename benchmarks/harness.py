@@ -0,0 +1,172 @@
+"""Benchmark das fases do compilador sobre programas sintéticos de tamanho
+crescente (benchmarks/workload.py).
+
+Mede lexer, Parser, SemanticAnalyzer e GtkTranslator em cada tamanho, estima
+o expoente de crescimento de cada fase (inclinação em escala log-log) e
+compara com um baseline salvo.
+
+    python -m benchmarks.harness                     # mede e compara com baseline.json
+    python -m benchmarks.harness --save-baseline     # mede e grava o baseline
+"""
+
+import gc
+import json
+import math
+import os
+import time
+from benchmarks.workload import WorkloadParams, generate_program
+from lexer.backends import DEFAULT_BACKEND, get_lexer
+from parser.parser import Parser
+from analisador_semantico.semantic import SemanticAnalyzer
+from tradutor.ctranslator import GtkTranslator
+
+PHASES = ("lexer", "parser", "semantic", "translator")
+DEFAULT_SCALES = (1, 2, 4, 8, 16)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Uma fase é considerada mais lenta que o baseline acima desta razão; medidas
+# abaixo de MIN_COMPARABLE_MS são dominadas por ruído e não contam.
+REGRESSION_THRESHOLD = 1.25
+MIN_COMPARABLE_MS = 1.0
+
+def _best_of(function, repeat):
+    """Melhor tempo (ms) de `repeat` execuções, com o coletor de lixo desligado
+    como no timeit, e o resultado da última."""
+    best = None
+    result = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best * 1000, result
+
+def measure(code, lexer_backend=DEFAULT_BACKEND, repeat=5):
+    """Melhor tempo (ms) de cada fase sobre `code`; cada fase recebe a saída da anterior."""
+    lexer = get_lexer(lexer_backend)
+    # Constrói os autômatos (ou carrega o scanner gerado) antes de medir
+    lexer("")
+    timings = {}
+    timings["lexer"], tokens = _best_of(lambda: lexer(code), repeat)
+    timings["parser"], ast = _best_of(lambda: Parser(tokens).parse(), repeat)
+
+    def analyze():
+        analyzer = SemanticAnalyzer()
+        symbol_table = analyzer.analyze(ast)
+        if analyzer.errors:
+            raise ValueError(f"Workload inválido: {analyzer.errors[0]}")
+        return symbol_table
+
+    timings["semantic"], symbol_table = _best_of(analyze, repeat)
+    timings["translator"], _ = _best_of(lambda: GtkTranslator(symbol_table).translate(), repeat)
+    return {phase: round(ms, 3) for phase, ms in timings.items()}, len(tokens)
+
+def growth_exponent(sizes, timings):
+    """Inclinação da reta de mínimos quadrados de log(tempo) x log(tamanho):
+    ~1 para fases lineares, ~2 para quadráticas."""
+    points = [(math.log(size), math.log(ms)) for size, ms in zip(sizes, timings) if size > 0 and ms > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / variance, 3)
+
+def run_sweep(base=None, scales=DEFAULT_SCALES, lexer_backend=DEFAULT_BACKEND, repeat=5):
+    """Mede todas as fases para cada fator de `scales` aplicado a `base` (WorkloadParams)."""
+    base = base or WorkloadParams()
+    results = {
+        "lexer_backend": lexer_backend,
+        "workload": base.to_dict(),
+        "scales": list(scales),
+        "input_bytes": [],
+        "tokens": [],
+        "phases": {phase: [] for phase in PHASES},
+    }
+    for scale in scales:
+        code = generate_program(base.scaled(scale))
+        timings, token_count = measure(code, lexer_backend, repeat)
+        results["input_bytes"].append(len(code.encode()))
+        results["tokens"].append(token_count)
+        for phase in PHASES:
+            results["phases"][phase].append(timings[phase])
+    results["growth_exponents"] = {
+        phase: growth_exponent(results["input_bytes"], results["phases"][phase]) for phase in PHASES
+    }
+    return results
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Razão atual/baseline por fase e tamanho; lista as que passam de `threshold`.
+    Só compara tamanhos presentes nos dois (mesmo workload e mesmas escalas)."""
+    if results["workload"] != baseline["workload"]:
+        raise ValueError("O baseline foi medido com outro workload; grave um novo com --save-baseline.")
+    shared = [scale for scale in results["scales"] if scale in baseline["scales"]]
+    ratios = {}
+    regressions = []
+    for phase in PHASES:
+        ratios[phase] = {}
+        for scale in shared:
+            current = results["phases"][phase][results["scales"].index(scale)]
+            previous = baseline["phases"][phase][baseline["scales"].index(scale)]
+            ratio = round(current / previous, 3) if previous else None
+            ratios[phase][scale] = ratio
+            if ratio is not None and ratio > threshold and max(current, previous) >= MIN_COMPARABLE_MS:
+                regressions.append({"phase": phase, "scale": scale, "ratio": ratio})
+    return {"ratios": ratios, "regressions": regressions}
+
+def format_table(results):
+    """Tabela de texto com os tempos por fase, uma linha por tamanho, e os expoentes."""
+    header = f'{"escala":>6} {"bytes":>10} {"tokens":>8} ' + ' '.join(f'{phase:>11}' for phase in PHASES)
+    lines = [header]
+    for index, scale in enumerate(results["scales"]):
+        lines.append(f'{scale:>6} {results["input_bytes"][index]:>10} {results["tokens"][index]:>8} '
+                     + ' '.join(f'{results["phases"][phase][index]:>9.3f}ms' for phase in PHASES))
+    lines.append(f'{"expoente":>26} ' + ' '.join(
+        f'{results["growth_exponents"][phase] if results["growth_exponents"][phase] is not None else "-":>11}'
+        for phase in PHASES))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    from lexer.backends import LEXER_BACKENDS
+
+    arg_parser = argparse.ArgumentParser(description="Benchmark das fases do compilador SimpleUI")
+    arg_parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                            help="fatores de tamanho do workload")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="repetições por medida (vale a melhor)")
+    arg_parser.add_argument('--lexer', choices=LEXER_BACKENDS, default=DEFAULT_BACKEND)
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="arquivo de baseline")
+    arg_parser.add_argument('--save-baseline', action='store_true', help="grava as medidas como novo baseline")
+    arg_parser.add_argument('--output', help="grava as medidas (e a comparação) em JSON")
+    args = arg_parser.parse_args()
+
+    results = run_sweep(scales=args.scales, lexer_backend=args.lexer, repeat=args.repeat)
+    print(format_table(results))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"\nBaseline gravado em {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        results["comparison"] = compare(results, baseline)
+        print("\nRazão atual/baseline:")
+        for phase, ratios in results["comparison"]["ratios"].items():
+            print(f'  {phase:<11} ' + ' '.join(f'{scale}x: {ratio}' for scale, ratio in ratios.items()))
+        for regression in results["comparison"]["regressions"]:
+            print(f'Regressão: {regression["phase"]} na escala {regression["scale"]} '
+                  f'({regression["ratio"]}x o baseline)')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
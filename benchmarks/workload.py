@@ -0,0 +1,118 @@
+"""Gerador de programas SimpleUI sintéticos, válidos para todas as fases do
+compilador (sem erros léxicos, sintáticos ou semânticos), usados nos
+benchmarks."""
+
+import random
+import string
+
+# Caracteres aceitos em strings (STRING = "[ !#-~]+"), sem as aspas
+STRING_ALPHABET = ''.join(chr(code) for code in range(32, 127) if chr(code) not in '"\\%')
+KEYS = string.ascii_uppercase + string.ascii_lowercase
+
+class WorkloadParams:
+    """Parâmetros de um programa sintético. `elements` é o número de
+    addElement (divididos entre inputs, labels e botões); os demais contam
+    handlers e variáveis, e `comment_density` é a fração de linhas seguidas
+    de um comentário."""
+
+    def __init__(self, elements=100, click_handlers=10, keypress_handlers=5, variables=20,
+                 actions_per_handler=4, comment_density=0.1, string_length=16, seed=0):
+        self.elements = elements
+        self.click_handlers = click_handlers
+        self.keypress_handlers = keypress_handlers
+        self.variables = variables
+        self.actions_per_handler = actions_per_handler
+        self.comment_density = comment_density
+        self.string_length = string_length
+        self.seed = seed
+
+    def scaled(self, factor):
+        """Mesmas proporções, com `factor` vezes mais elementos, handlers e variáveis."""
+        return WorkloadParams(
+            max(3, round(self.elements * factor)),
+            max(1, round(self.click_handlers * factor)),
+            max(1, round(self.keypress_handlers * factor)),
+            max(1, round(self.variables * factor)),
+            self.actions_per_handler, self.comment_density, self.string_length, self.seed,
+        )
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def generate_program(params=None):
+    """Gera o código-fonte de um programa SimpleUI a partir de `params` (WorkloadParams)."""
+    params = params or WorkloadParams()
+    rng = random.Random(params.seed)
+    lines = []
+
+    def text():
+        length = max(1, round(rng.gauss(params.string_length, params.string_length / 4)))
+        return '"' + ''.join(rng.choice(STRING_ALPHABET) for _ in range(length)).strip() + 'x"'
+
+    def emit(line):
+        lines.append(line)
+        if rng.random() < params.comment_density:
+            lines.append('## ' + ''.join(rng.choice(string.ascii_letters + ' ') for _ in range(params.string_length)))
+
+    emit('createWindow("Sintetico", width=800, height=600);')
+
+    # Um terço de cada tipo; os botões são os alvos dos onClick
+    inputs, labels, buttons = [], [], []
+    for index in range(params.elements):
+        kind = ('input', 'label', 'button')[index % 3]
+        element_id = f'{kind}{index}'
+        x, y = rng.randrange(0, 800), rng.randrange(0, 600)
+        if kind == 'input':
+            inputs.append(element_id)
+            emit(f'addElement(type="input", id="{element_id}", placeholder={text()}, x={x}, y={y});')
+        elif kind == 'label':
+            labels.append(element_id)
+            emit(f'addElement(type="label", id="{element_id}", text={text()}, x={x}, y={y});')
+        else:
+            buttons.append(element_id)
+            emit(f'addElement(type="button", id="{element_id}", text={text()}, x={x}, y={y});')
+
+    # Variáveis de texto podem ser deslocadas por shiftElement; as numéricas não
+    text_variables, number_variables = [], []
+    for index in range(params.variables):
+        if index % 2 == 0:
+            name = f'texto{index}'
+            text_variables.append(name)
+            emit(f'let {name} = {text()};')
+        else:
+            name = f'numero{index}'
+            number_variables.append(name)
+            emit(f'let {name} = {rng.randrange(0, 10000)};')
+
+    for index in range(params.click_handlers):
+        emit(f'onClick("{buttons[index % len(buttons)] if buttons else "button"}") {{')
+        for action in range(params.actions_per_handler):
+            if labels and (action % 2 == 0 or not text_variables):
+                parts = [text()] + [rng.choice(text_variables) for _ in range(rng.randrange(0, 3)) if text_variables]
+                emit(f'    setProperty("{rng.choice(labels)}", text={" + ".join(parts)});')
+            else:
+                emit(f'    let local{index}x{action} = {text()};')
+        emit('}')
+
+    for index in range(params.keypress_handlers):
+        emit(f'onKeypress("{KEYS[index % len(KEYS)]}") {{')
+        for action in range(params.actions_per_handler):
+            if text_variables:
+                emit(f'    shiftElement("{rng.choice(text_variables)}", x={rng.randrange(-20, 21)}, y={rng.randrange(-20, 21)});')
+            else:
+                emit(f'    let tecla{index}x{action} = {rng.randrange(0, 100)};')
+        emit('}')
+
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Gera um programa SimpleUI sintético")
+    defaults = WorkloadParams()
+    for name, value in defaults.to_dict().items():
+        arg_parser.add_argument(f'--{name.replace("_", "-")}', type=type(value), default=value)
+    args = arg_parser.parse_args()
+    print(generate_program(WorkloadParams(**vars(args))), end='')
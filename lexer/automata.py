@@ -1,4 +1,76 @@
-from graphviz import Digraph
+from types import MappingProxyType
+from lexer.table import DFATable
+from lexer.minimize import hopcroft, count_transitions
+
+def _check_many(table, words):
+    """Classifica uma lista de palavras sobre `table`, avaliando cada palavra distinta uma vez."""
+    accepts = table.accepts
+    results = {}
+    checked = []
+    for word in words:
+        if word not in results:
+            results[word] = accepts(word)
+        checked.append(results[word])
+    return checked
+
+class FrozenAFD:
+    """Forma imutável de um AFD: estados numerados (o inicial é 0) e, para cada
+    estado, um dicionário somente leitura símbolo -> próximo estado."""
+
+    __slots__ = ('names', 'transitions', 'finals', 'alphabet', 'initial', '_table')
+
+    def __init__(self, names, transitions, finals, alphabet):
+        object.__setattr__(self, 'names', tuple(names))
+        object.__setattr__(self, 'transitions', tuple(MappingProxyType(dict(t)) for t in transitions))
+        object.__setattr__(self, 'finals', frozenset(finals))
+        object.__setattr__(self, 'alphabet', frozenset(alphabet))
+        object.__setattr__(self, 'initial', 0)
+        object.__setattr__(self, '_table', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenAFD é imutável")
+
+    def __len__(self):
+        return len(self.names)
+
+    def is_final(self, state):
+        return state in self.finals
+
+    def step(self, state, symbol):
+        return self.transitions[state].get(symbol)
+
+    def to_table(self):
+        """Exporta o autômato como DFATable (matriz densa com classes de símbolos)."""
+        return DFATable(self.transitions, self.finals, self.alphabet)
+
+    @property
+    def table(self):
+        """DFATable compartilhada, construída na primeira consulta."""
+        if self._table is None:
+            object.__setattr__(self, '_table', self.to_table())
+        return self._table
+
+    def word_checker(self, word):
+        return self.table.accepts(word)
+
+    def word_checker_many(self, words):
+        return _check_many(self.table, words)
+
+    def minimize(self):
+        """Retorna (frozen_minimo, estatisticas), com o FrozenAFD mínimo
+        equivalente calculado por Hopcroft (veja AFD.minimize)."""
+        labels = [state in self.finals for state in range(len(self))]
+        transitions, representatives = hopcroft(self.transitions, labels, self.alphabet)
+        names = [self.names[state] for state in representatives]
+        finals = [i for i, state in enumerate(representatives) if state in self.finals]
+        minimal = FrozenAFD(names, transitions, finals, self.alphabet)
+        stats = {
+            "states_before": len(self),
+            "states_after": len(minimal),
+            "transitions_before": count_transitions(self.transitions),
+            "transitions_after": count_transitions(minimal.transitions),
+        }
+        return minimal, stats
 
 class AFD:
     class State:
@@ -19,6 +91,7 @@ class AFD:
         self.transitions = {}
         self.final_states = set()
         self.initial_state = None
+        self._table = None
         
         #atributos auxiliares
         #self.visitados = []
@@ -32,6 +105,7 @@ class AFD:
     def add_state(self, name, is_initial=False, is_final=False):
         state = self.State(name, is_initial, is_final)
         self.states.add(state)
+        self._table = None
         if is_initial:
             self.initial_state = state
         if is_final:
@@ -50,25 +124,86 @@ class AFD:
                     return
         self.transitions[origin].append(transicao)
         self.alphabet.add(symbol)
+        self._table = None
 
     def transicao_estendida(self, current_state, word):
-        def transicao(state, symbol):
-            if state in self.transitions:
-                for transicao in self.transitions[state]:
-                    if transicao.symbol == symbol:
-                        return transicao.destine
-            return None
-        if word == '':
-            #auxiliar
-            #self.visitados += [current_state]
-            return current_state
-        
-        return transicao(self.transicao_estendida(current_state, word[:-1]), word[-1])
+        """Estado alcançado após ler `word` a partir de `current_state`, ou None
+        se alguma transição não existir."""
+        for symbol in word:
+            next_state = None
+            for transicao in self.transitions.get(current_state, ()):
+                if transicao.symbol == symbol:
+                    next_state = transicao.destine
+                    break
+            if next_state is None:
+                return None
+            current_state = next_state
+        return current_state
 
     def word_checker(self, word):
-        return self.transicao_estendida(self.initial_state, word).is_final
+        state = self.transicao_estendida(self.initial_state, word)
+        return state is not None and state.is_final
+
+    def word_checker_many(self, words):
+        """Classifica várias palavras de uma vez sobre a tabela densa do autômato.
+
+        A tabela é construída na primeira chamada e reaproveitada enquanto o
+        autômato não for alterado."""
+        if self._table is None:
+            self._table = self.to_table()
+        return _check_many(self._table, words)
+
+    def freeze(self):
+        """Congela o autômato em um FrozenAFD.
+
+        Apenas estados alcançáveis são mantidos. Quando há mais de uma transição
+        para o mesmo símbolo, vale a primeira cadastrada, como no laço do lexer."""
+        index = {self.initial_state: 0}
+        order = [self.initial_state]
+        transitions = []
+        for state in order:
+            table = {}
+            for transicao in self.transitions.get(state, []):
+                if transicao.symbol in table:
+                    continue
+                if transicao.destine not in index:
+                    index[transicao.destine] = len(order)
+                    order.append(transicao.destine)
+                table[transicao.symbol] = index[transicao.destine]
+            transitions.append(table)
+        finals = [i for i, state in enumerate(order) if state.is_final]
+        return FrozenAFD([state.name for state in order], transitions, finals, self.alphabet)
+
+    def to_table(self):
+        """Exporta o autômato como DFATable; veja FrozenAFD.to_table."""
+        return self.freeze().to_table()
+
+    def minimize(self):
+        """Retorna (afd_minimo, estatisticas).
+
+        O AFD mínimo é equivalente a este (com a regra de a primeira transição
+        cadastrada prevalecer) e as estatísticas trazem a contagem de estados e
+        transições antes e depois da minimização."""
+        frozen, _ = self.freeze().minimize()
+        minimal = AFD()
+        states = [
+            minimal.add_state(name, is_initial=(i == frozen.initial), is_final=(i in frozen.finals))
+            for i, name in enumerate(frozen.names)
+        ]
+        for origin, table in enumerate(frozen.transitions):
+            for symbol, destine in table.items():
+                minimal.add_transition(states[origin], states[destine], symbol)
+        stats = {
+            "states_before": len(self.states),
+            "states_after": len(minimal.states),
+            "transitions_before": count_transitions(self.transitions.values()),
+            "transitions_after": count_transitions(minimal.transitions.values()),
+        }
+        return minimal, stats
 
     def plot(self, name):
+        from graphviz import Digraph  # só quem desenha precisa do graphviz
+
         dot = Digraph(format='png')
         dot.attr(rankdir='LR', dpi='300', nodesep="1", ranksep="10", splines='true')
 
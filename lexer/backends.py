@@ -0,0 +1,57 @@
+from lexer.lexer import lexer
+from lexer.codegen import lexer_gerado
+from lexer.regex_lexer import lexer_regex
+from lexer.token_stream import lexer_token_stream
+
+LEXER_BACKENDS = {
+    "automato": lexer,
+    "gerado": lexer_gerado,
+    "regex": lexer_regex,
+    "compacto": lexer_token_stream,
+}
+
+DEFAULT_BACKEND = "automato"
+
+def get_lexer(name=DEFAULT_BACKEND):
+    if name not in LEXER_BACKENDS:
+        raise ValueError(f"Lexer desconhecido: {name!r} (opções: {', '.join(LEXER_BACKENDS)})")
+    return LEXER_BACKENDS[name]
+
+
+def _run(backend, code):
+    try:
+        return [(t.token_class, t.token_value, t.line, t.column) for t in get_lexer(backend)(code)], None
+    except SyntaxError as e:
+        return None, str(e)
+
+
+def differential_check(code, backends=("automato", "regex")):
+    """Executa dois lexers sobre `code` e lista as divergências.
+
+    Retorna uma lista vazia quando os dois produzem os mesmos tokens (classe,
+    valor, linha e coluna) ou o mesmo erro léxico. Caso contrário, cada item
+    descreve a primeira divergência encontrada."""
+    reference, candidate = backends
+    reference_tokens, reference_error = _run(reference, code)
+    candidate_tokens, candidate_error = _run(candidate, code)
+
+    if reference_error or candidate_error:
+        if reference_error == candidate_error:
+            return []
+        return [{"index": None, reference: reference_error, candidate: candidate_error}]
+
+    mismatches = []
+    for index in range(max(len(reference_tokens), len(candidate_tokens))):
+        expected = reference_tokens[index] if index < len(reference_tokens) else None
+        found = candidate_tokens[index] if index < len(candidate_tokens) else None
+        if expected != found:
+            mismatches.append({"index": index, reference: _describe(expected), candidate: _describe(found)})
+            break
+    return mismatches
+
+
+def _describe(token):
+    if token is None:
+        return None
+    token_class, value, line, column = token
+    return f"{token_class.name} {value!r} (Linha: {line}, Coluna: {column})"
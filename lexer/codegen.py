@@ -0,0 +1,203 @@
+import hashlib
+import importlib.util
+import os
+import time
+from lexer.registry import get_registry
+
+GENERATOR_VERSION = 1
+
+# Módulos cujo conteúdo determina o scanner gerado
+DEFINITION_MODULES = (
+    'my_token.py',
+    'automata.py',
+    'automata_functions.py',
+    'union.py',
+    'minimize.py',
+    'table.py',
+    'codegen.py',
+)
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('SIMPLEUI_CACHE_DIR', '.simpleui_cache'), 'lexer')
+
+def definitions_hash():
+    """Hash das definições dos autômatos e do próprio gerador."""
+    digest = hashlib.sha256(f'v{GENERATOR_VERSION}'.encode())
+    lexer_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in DEFINITION_MODULES:
+        with open(os.path.join(lexer_dir, name), 'rb') as file:
+            digest.update(name.encode())
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def generate_source(union, digest):
+    """Gera o código de um módulo Python especializado no UnionAFD `union`.
+
+    Cada estado vira um dicionário literal símbolo -> estado. Estados com laço
+    sobre si mesmos (identificadores, números, espaços, comentários, strings)
+    ganham um conjunto com os símbolos do laço, consumidos em um só trecho."""
+    lines = [
+        '# Gerado por lexer/codegen.py a partir de lexer/automata_functions.py. Não edite.',
+        'from lexer.my_token import TokenClass, Token',
+        '',
+        f'DEFINITIONS_HASH = {digest!r}',
+        f'TOKEN_CLASSES = ({"".join(f"TokenClass.{c.name}, " for c in union.token_classes)})',
+        f'TAGS = {bytes(union.tags)!r}',
+        f'LIVE = {bytes(union.live)!r}',
+        f'NO_MATCH = {len(union.token_classes)}',
+        '',
+    ]
+    loops = {}
+    for state, table in enumerate(union.transitions):
+        items = ', '.join(f'{symbol!r}: {destine}' for symbol, destine in sorted(table.items()))
+        lines.append(f'_T{state} = {{{items}}}')
+        loop = ''.join(sorted(symbol for symbol, destine in table.items() if destine == state))
+        if loop:
+            loops[state] = loop
+    lines.append('TRANSITIONS = (' + ''.join(f'_T{state}, ' for state in range(len(union))) + ')')
+    lines.append('LOOPS = {' + ', '.join(f'{state}: frozenset({loop!r})' for state, loop in sorted(loops.items())) + '}')
+    lines.append('SKIPPED = (TokenClass.ESPACO_EM_BRANCO, TokenClass.COMENTARIO)')
+    lines.append('')
+    lines.append('''
+def lex(code):
+    tokens = []
+    append = tokens.append
+    transitions = TRANSITIONS
+    loops = LOOPS
+    tags = TAGS
+    live = LIVE
+    position = 0
+    length = len(code)
+    current_line = 1
+    current_column = 1
+    while position < length:
+        if code[position] == '-' and position + 1 < length and code[position + 1].isdigit():
+            lookahead = position + 2
+            while lookahead < length and code[lookahead].isdigit():
+                lookahead += 1
+            token_class = TokenClass.NUMERO
+        else:
+            state = 0
+            best = NO_MATCH
+            end = position
+            lookahead = position
+            while lookahead < length:
+                state = transitions[state].get(code[lookahead])
+                if state is None:
+                    break
+                lookahead += 1
+                if state in loops:
+                    loop = loops[state]
+                    while lookahead < length and code[lookahead] in loop:
+                        lookahead += 1
+                if tags[state] <= best:
+                    best = tags[state]
+                    end = lookahead
+                if live[state] > best:
+                    break
+            if best == NO_MATCH:
+                raise SyntaxError(f"Erro léxico na linha {current_line}, coluna {current_column}: caractere inesperado: {code[position]!r}")
+            token_class = TOKEN_CLASSES[best]
+            lookahead = end
+        lexeme = code[position:lookahead]
+        if token_class not in SKIPPED:
+            append(Token(token_class, lexeme, current_line, current_column, position))
+        newlines = lexeme.count('\\n')
+        if newlines:
+            current_line += newlines
+            current_column = len(lexeme) - lexeme.rfind('\\n')
+        else:
+            current_column += len(lexeme)
+        position = lookahead
+    return tokens
+'''.lstrip('\n'))
+    return '\n'.join(lines)
+
+
+def load_generated_scanner(cache_dir=DEFAULT_CACHE_DIR, regenerate=False):
+    """Carrega o scanner gerado do cache em disco, gerando-o se preciso.
+
+    Retorna (módulo, info), onde info traz o hash, se o arquivo veio do cache
+    e os tempos de geração e carga em ms."""
+    digest = definitions_hash()
+    path = os.path.join(cache_dir, f'scanner_{digest}.py')
+    info = {"hash": digest, "path": path, "cached": os.path.exists(path) and not regenerate, "generate_ms": 0.0}
+
+    if not info["cached"]:
+        start = time.perf_counter()
+        source = generate_source(get_registry().union, digest)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Remove só as versões antigas: o arquivo deste hash pode ter acabado
+        # de ser gravado por outro processo (--jobs), que vai carregá-lo
+        for name in os.listdir(cache_dir):
+            if name.startswith('scanner_') and name.endswith('.py') and name != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except FileNotFoundError:
+                    pass
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(source)
+        os.replace(temporary, path)
+        info["generate_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f'simpleui_scanner_{digest}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    info["load_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return module, info
+
+
+_scanner = None
+
+def lexer_gerado(code):
+    """Mesmo resultado de lexer(), usando o scanner gerado (carregado uma vez por processo)."""
+    global _scanner
+    if _scanner is None:
+        _scanner, _ = load_generated_scanner()
+    return _scanner.lex(code)
+
+
+def benchmark(code, repeat=5):
+    """Compara os tempos (ms) do lexer interpretado e do scanner gerado, a frio e a quente."""
+    from lexer.lexer import lexer
+
+    def best_of(function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(code)
+            timings.append(time.perf_counter() - start)
+        return round(min(timings) * 1000, 3)
+
+    start = time.perf_counter()
+    registry = get_registry()
+    registry_ms = round((time.perf_counter() - start) * 1000, 3)
+    interpreted_lex_ms = best_of(lexer)
+
+    cold, cold_info = load_generated_scanner(regenerate=True)
+    warm, warm_info = load_generated_scanner()
+    return {
+        "input_chars": len(code),
+        "interpreted": {"registry_ms": registry_ms, "lex_ms": interpreted_lex_ms},
+        "generated_cold": {
+            "generate_ms": cold_info["generate_ms"],
+            "load_ms": cold_info["load_ms"],
+            "lex_ms": best_of(cold.lex),
+        },
+        "generated_warm": {
+            "load_ms": warm_info["load_ms"],
+            "lex_ms": best_of(warm.lex),
+        },
+    }
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+    from utils.helpers import read_file
+
+    paths = sys.argv[1:] or [os.path.join('testes', name) for name in sorted(os.listdir('testes')) if name.endswith('.simpleui')]
+    source = '\n'.join(read_file(path) for path in paths)
+    print(json.dumps(benchmark(source), indent=4))
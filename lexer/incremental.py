@@ -0,0 +1,76 @@
+from bisect import bisect_right
+from lexer.my_token import Token
+from lexer.lexer import scan_tokens, SKIPPED_CLASSES
+
+# Maior número de caracteres que o lexer examina além do fim de um token
+# (ex.: "1." seguido de algo que não é dígito: o '.' e o caractere seguinte
+# são lidos antes de o número terminar em "1"). Recomeçar a análise em um
+# token que começa pelo menos LOOKAHEAD caracteres antes da edição garante
+# que a divisão em tokens até ali não depende do texto editado.
+LOOKAHEAD = 2
+
+def relex(previous_tokens, edit, new_text):
+    """Atualiza a lista de tokens após uma edição, sem reanalisar o texto todo.
+
+    `previous_tokens` é a saída de lexer() para o texto anterior (os tokens
+    precisam de `offset`), `edit` é a tupla (offset, tamanho_removido,
+    texto_inserido) e `new_text` é o texto já editado. A análise recomeça no
+    último token seguro antes da edição e para assim que um token novo
+    coincide com um token antigo depois da edição; os tokens seguintes são
+    reaproveitados (os mesmos objetos) com posições atualizadas.
+
+    Retorna (tokens, estatisticas)."""
+    edit_offset, removed_length, inserted_text = edit
+    delta = len(inserted_text) - removed_length
+    old_edit_end = edit_offset + removed_length
+    new_edit_end = edit_offset + len(inserted_text)
+
+    restart_index = bisect_right(previous_tokens, edit_offset - LOOKAHEAD, key=lambda token: token.offset) - 1
+    if restart_index >= 0:
+        restart = previous_tokens[restart_index]
+        position, line, column = restart.offset, restart.line, restart.column
+    else:
+        restart_index = 0
+        position, line, column = 0, 1, 1
+
+    resync_index = bisect_right(previous_tokens, old_edit_end - 1, key=lambda token: token.offset)
+    relexed = []
+    resync = None
+    for token_class, start, end, token_line, token_column in scan_tokens(new_text, position, line, column):
+        if start >= new_edit_end:
+            old_start = start - delta
+            while resync_index < len(previous_tokens) and previous_tokens[resync_index].offset < old_start:
+                resync_index += 1
+            if resync_index == len(previous_tokens):
+                if token_class not in SKIPPED_CLASSES:
+                    relexed.append(Token(token_class, new_text[start:end], token_line, token_column, start))
+                continue
+            candidate = previous_tokens[resync_index]
+            if candidate.offset == old_start and candidate.token_class == token_class:
+                resync = (token_line, token_column)
+                break
+        if token_class not in SKIPPED_CLASSES:
+            relexed.append(Token(token_class, new_text[start:end], token_line, token_column, start))
+
+    suffix = previous_tokens[resync_index:] if resync is not None else []
+    if suffix:
+        _shift(suffix, delta, resync[0] - suffix[0].line, resync[1] - suffix[0].column)
+
+    tokens = previous_tokens[:restart_index] + relexed + suffix
+    stats = {
+        "relexed_tokens": len(relexed),
+        "reused_tokens": len(tokens) - len(relexed),
+        "relexed_chars": (suffix[0].offset if suffix else len(new_text)) - position,
+    }
+    return tokens, stats
+
+
+def _shift(tokens, delta, line_delta, column_delta):
+    """Desloca offsets e linhas dos tokens reaproveitados; a coluna só muda
+    para os que estão na mesma linha do primeiro deles."""
+    first_line = tokens[0].line
+    for token in tokens:
+        if token.line == first_line:
+            token.column += column_delta
+        token.line += line_delta
+        token.offset += delta
@@ -1,75 +1,51 @@
 import re
 from lexer.my_token import TokenClass, Token
-from lexer.automata_functions import automata_functions
+from lexer.registry import get_registry
 
-def lexer(code):
-    tokens = []
-    position = 0
-    length = len(code)
+SKIPPED_CLASSES = (TokenClass.ESPACO_EM_BRANCO, TokenClass.COMENTARIO)
 
-    current_line = 1
-    current_column = 1
-    
-    while position < length:
-        match_found = False
-        for token_class, automaton_function in automata_functions.items():
-            afd = automaton_function()
-            current_state = afd.initial_state
-            lookahead = position
-            last_accepting_position = None
-            last_accepting_state = None
+def advance_position(text, start, end, line, column):
+    """(linha, coluna) logo depois de text[start:end], que começa em (line, column)."""
+    newlines = text.count('\n', start, end)
+    if newlines:
+        return line + newlines, end - text.rfind('\n', start, end)
+    return line, column + end - start
 
-            token_start_line = current_line
-            token_start_column = current_column
+def scan_tokens(code, position=0, current_line=1, current_column=1):
+    """Percorre `code` a partir de `position` e gera (token_class, início, fim,
+    linha, coluna) para cada token, inclusive espaços e comentários.
 
-            if code[position] == '-' and position + 1 < length and code[position + 1].isdigit():
-                lookahead += 1
-                while lookahead < length and code[lookahead].isdigit():
-                    lookahead += 1
-                lexeme = code[position:lookahead]
-                tokens.append(Token(TokenClass.NUMERO, lexeme, token_start_line, token_start_column))
-                position = lookahead
-                match_found = True
-                break
-
-            while lookahead < length:
-                symbol = code[lookahead]
+    Usa uma única passada pela tabela densa do autômato união: em cada posição
+    vale a classe de maior prioridade (ordem de automata_functions) que
+    reconhece algum prefixo, com o prefixo mais longo."""
+    length = len(code)
 
-                next_state = None
-                if current_state in afd.transitions:
-                    for transicao in afd.transitions[current_state]:
-                        if transicao.symbol == symbol:
-                            next_state = transicao.destine
-                            break
-                if next_state is None:
-                    break
-                current_state = next_state
+    table = get_registry().table
+    
+    while position < length:
+        if code[position] == '-' and position + 1 < length and code[position + 1].isdigit():
+            lookahead = position + 1
+            while lookahead < length and code[lookahead].isdigit():
                 lookahead += 1
+            token_class = TokenClass.NUMERO
+        else:
+            token_class, lookahead = table.match(code, position)
+            if token_class is None:
+                raise SyntaxError(f"Erro léxico na linha {current_line}, coluna {current_column}: caractere inesperado: {code[position]!r}")
 
-                if symbol == '\n':
-                    current_line += 1
-                    current_column = 1
-                else:
-                    current_column += 1
-
-                if current_state.is_final:
-                    last_accepting_position = lookahead
-                    last_accepting_state = current_state
+        yield token_class, position, lookahead, current_line, current_column
 
-            if last_accepting_state is not None:
-                lexeme = code[position:last_accepting_position]
-                if token_class not in (TokenClass.ESPACO_EM_BRANCO, TokenClass.COMENTARIO):
-                    token = Token(token_class, lexeme, token_start_line, token_start_column)
-                    tokens.append(token)
+        # Caminho rápido para o caso comum, o de um token sem quebra de linha
+        if code.find('\n', position, lookahead) < 0:
+            current_column += lookahead - position
+        else:
+            current_line, current_column = advance_position(code, position, lookahead, current_line, current_column)
+        position = lookahead
 
-                position = last_accepting_position
-                match_found = True
-                break
-
-        if not match_found:
-            error_line = current_line
-            error_column = current_column
-            raise SyntaxError(f"Erro léxico na linha {error_line}, coluna {error_column}: caractere inesperado: {code[position]!r}")
-    
-    return tokens
+def lexer(code):
+    return [
+        Token(token_class, code[start:end], line, column, start)
+        for token_class, start, end, line, column in scan_tokens(code)
+        if token_class not in SKIPPED_CLASSES
+    ]
 
@@ -0,0 +1,79 @@
+def count_transitions(transitions):
+    return sum(len(table) for table in transitions)
+
+
+def hopcroft(transitions, labels, alphabet, dead_label=False):
+    """Minimiza um AFD por refinamento de partições (algoritmo de Hopcroft).
+
+    `transitions` é uma lista de dicionários símbolo -> estado (o estado 0 é
+    o inicial) e `labels` dá, para cada estado, o rótulo que deve ser
+    preservado (final ou não, classe de token aceita...). Transições ausentes
+    levam a um estado morto implícito, com rótulo `dead_label` (o de um
+    estado que não aceita); estados equivalentes a ele, como os que nunca
+    chegam a aceitar, são descartados.
+
+    Retorna (transições, representantes): as transições do autômato mínimo,
+    com o estado inicial em 0 e os demais em ordem de busca em largura, e,
+    para cada novo estado, o menor estado original do seu bloco."""
+    dead = len(transitions)
+    num_states = dead + 1
+    alphabet = sorted(alphabet)
+
+    inverse = {symbol: {} for symbol in alphabet}
+    for state in range(num_states):
+        table = transitions[state] if state != dead else {}
+        for symbol in alphabet:
+            inverse[symbol].setdefault(table.get(symbol, dead), []).append(state)
+
+    blocks = []
+    block_of = [0] * num_states
+    by_label = {}
+    for state in range(num_states):
+        label = labels[state] if state != dead else dead_label
+        if label not in by_label:
+            by_label[label] = len(blocks)
+            blocks.append(set())
+        block_of[state] = by_label[label]
+        blocks[by_label[label]].add(state)
+
+    pending = set(range(len(blocks)))
+    while pending:
+        splitter = set(blocks[pending.pop()])
+        for symbol in alphabet:
+            predecessors = inverse[symbol]
+            touched = {}
+            for state in splitter:
+                for origin in predecessors.get(state, ()):
+                    touched.setdefault(block_of[origin], []).append(origin)
+            for block, states in touched.items():
+                if len(states) == len(blocks[block]):
+                    continue
+                new_block = len(blocks)
+                moved = set(states)
+                blocks[block] -= moved
+                blocks.append(moved)
+                for state in moved:
+                    block_of[state] = new_block
+                if block in pending or len(moved) <= len(blocks[block]):
+                    pending.add(new_block)
+                else:
+                    pending.add(block)
+
+    dead_block = block_of[dead]
+    index = {block_of[0]: 0}
+    order = [block_of[0]]
+    minimal = []
+    for block in order:
+        representative = min(blocks[block])
+        table = {}
+        for symbol, destine in transitions[representative].items():
+            destine_block = block_of[destine]
+            if destine_block == dead_block:
+                continue
+            if destine_block not in index:
+                index[destine_block] = len(order)
+                order.append(destine_block)
+            table[symbol] = index[destine_block]
+        minimal.append(table)
+    representatives = [min(blocks[block]) for block in order]
+    return minimal, representatives
@@ -1,21 +1,29 @@
 from enum import Enum
 
+# Cada padrão descreve exatamente a linguagem do autômato correspondente em
+# automata_functions.py (o lexer por regex depende disso). No autômato de palavras
+# reservadas vale a primeira transição cadastrada, então palavras que começam
+# como uma anterior da lista (loop, every, moveElement, showElement, onClick,
+# setProperty, sprite) são reconhecidas como IDENTIFICADOR, e o parser conta com
+# isso para onClick e setProperty.
 class TokenClass(Enum):
-    PALAVRA_RESERVADA = r"\b(let|function|if|else|repeat|times|loop|every|ms|createWindow|addElement|moveElement|shiftElement|showElement|hideElement|onKeypress|onClick|getProperty|setProperty|sprite)\b"
-    OPERADOR = r"(\+|\-|\/|\*|=|<|<=|>|>=|+=|\-=|\+\+|\-\-)"
-    DELIMITADOR = r"(,|;|\(|\)|\.|\{|\})"
-    IDENTIFICADOR = r"\b[a-zA-Z][a-zA-Z0-9]*\b"
-    NUMERO = r"\b\d+(\.\d+)?\b"
-    COMENTARIO = r'##.*'
-    ESPACO_EM_BRANCO = r"\s+"
-    STRING = r'(?<!")"(?!"")[^"]*"'
+    PALAVRA_RESERVADA = r"let|function|if|else|repeat|times|ms|createWindow|addElement|shiftElement|hideElement|onKeypress|getProperty"
+    OPERADOR = r"\+\+|\+=|--|-=|<=|>=|[+\-*/=<>]"
+    DELIMITADOR = r"[,;().{}]"
+    IDENTIFICADOR = r"[a-zA-Z][a-zA-Z0-9]*"
+    NUMERO = r"[0-9]+(?:\.[0-9]+)?"
+    COMENTARIO = r"##[ -~]*"
+    ESPACO_EM_BRANCO = r"[ \t\n\r]+"
+    STRING = r'"[ !#-~]+"'
 
 class Token:
-    def __init__(self, token_class, token_value, line, column):
+    def __init__(self, token_class, token_value, line, column, offset=None):
         self.token_class = token_class
         self.token_value = token_value
         self.line = line
         self.column = column
+        # Posição do início do token no texto (usada pelo relex incremental)
+        self.offset = offset
 
     def __str__(self):
         return f'Classe do Token: {self.token_class.name}, Valor: {self.token_value}, Linha: {self.line}, Coluna: {self.column}'
\ No newline at end of file
@@ -0,0 +1,45 @@
+import re
+from lexer.my_token import TokenClass, Token
+from lexer.lexer import advance_position
+
+NEGATIVE_NUMBER = 'NUMERO_NEGATIVO'
+
+def build_master_pattern():
+    """Compila os padrões de TokenClass em uma única regex com grupos nomeados.
+
+    As alternativas seguem a ordem de TokenClass, que é a prioridade do lexer
+    por autômatos, precedidas pelo caso especial de número negativo."""
+    alternatives = [rf'(?P<{NEGATIVE_NUMBER}>-[0-9]+)']
+    alternatives += [f'(?P<{token_class.name}>{token_class.value})' for token_class in TokenClass]
+    return re.compile('|'.join(alternatives))
+
+MASTER_PATTERN = build_master_pattern()
+
+GROUP_CLASSES = {token_class.name: token_class for token_class in TokenClass}
+GROUP_CLASSES[NEGATIVE_NUMBER] = TokenClass.NUMERO
+
+def lexer_regex(code):
+    """Mesmo resultado de lexer(), com o laço de varredura feito pelo módulo re."""
+    tokens = []
+    position = 0
+    current_line = 1
+    current_column = 1
+    skipped = (TokenClass.ESPACO_EM_BRANCO, TokenClass.COMENTARIO)
+
+    for match in MASTER_PATTERN.finditer(code):
+        if match.start() != position:
+            break
+        token_class = GROUP_CLASSES[match.lastgroup]
+        lexeme = match.group()
+        if token_class not in skipped:
+            tokens.append(Token(token_class, lexeme, current_line, current_column, position))
+
+        if '\n' not in lexeme:
+            current_column += len(lexeme)
+        else:
+            current_line, current_column = advance_position(code, position, match.end(), current_line, current_column)
+        position = match.end()
+
+    if position < len(code):
+        raise SyntaxError(f"Erro léxico na linha {current_line}, coluna {current_column}: caractere inesperado: {code[position]!r}")
+    return tokens
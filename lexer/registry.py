@@ -0,0 +1,69 @@
+import json
+import threading
+import time
+from types import MappingProxyType
+from lexer.automata_functions import automata_functions
+from lexer.union import build_union
+
+class AutomataRegistry:
+    """Constrói cada autômato de automata_functions uma única vez, congela e
+    guarda o resultado junto com o tempo gasto em cada construção.
+
+    Também monta o autômato união (UnionAFD), já minimizado, e sua tabela
+    densa, usada pelo lexer."""
+
+    def __init__(self, functions=automata_functions):
+        automata = {}
+        build_times = {}
+        for token_class, automaton_function in functions.items():
+            start = time.perf_counter()
+            automata[token_class] = automaton_function().freeze()
+            build_times[token_class] = time.perf_counter() - start
+        self.automata = MappingProxyType(automata)
+        self.build_times = MappingProxyType(build_times)
+
+        start = time.perf_counter()
+        self.union, self.minimization = build_union(self.automata).minimize()
+        self.table = self.union.to_table()
+        self.union_build_time = time.perf_counter() - start
+
+    @property
+    def total_build_time(self):
+        return sum(self.build_times.values()) + self.union_build_time
+
+    def report(self):
+        """Relatório de construção: estados e tempo (em ms) de cada autômato."""
+        return {
+            "automata": {
+                token_class.name: {
+                    "states": len(afd),
+                    "build_ms": round(self.build_times[token_class] * 1000, 3),
+                }
+                for token_class, afd in self.automata.items()
+            },
+            "union": {
+                "states": len(self.union),
+                "minimization": dict(self.minimization),
+                "symbol_classes": self.table.num_classes,
+                "table_bytes": self.table.nbytes(),
+                "build_ms": round(self.union_build_time * 1000, 3),
+            },
+            "total_build_ms": round(self.total_build_time * 1000, 3),
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """Retorna o registro compartilhado pelo processo, construindo-o na primeira chamada."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AutomataRegistry()
+    return _registry
+
+
+if __name__ == '__main__':
+    print(json.dumps(get_registry().report(), indent=4))
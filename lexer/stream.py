@@ -0,0 +1,69 @@
+from lexer.my_token import TokenClass, Token
+from lexer.registry import get_registry
+from lexer.lexer import advance_position
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+def lexer_stream(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Versão geradora de lexer() que lê `stream` em blocos de `chunk_size`.
+
+    Um token que atravessa o fim de um bloco (string, comentário, número...)
+    é completado com o bloco seguinte antes de ser emitido, então a memória
+    usada fica limitada pelo tamanho do bloco mais o do maior token."""
+    table = get_registry().table
+    no_match = len(table.token_classes)
+
+    buffer = ''
+    position = 0
+    eof = False
+    # Quantos caracteres do stream já foram descartados do início do buffer
+    consumed = 0
+
+    current_line = 1
+    current_column = 1
+
+    while True:
+        if position >= len(buffer):
+            if eof:
+                return
+            consumed += len(buffer)
+            buffer, position = stream.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        if buffer[position] == '-' and position + 1 == len(buffer) and not eof:
+            consumed += position
+            buffer, position, eof = _refill(stream, buffer, position, chunk_size)
+            continue
+
+        if buffer[position] == '-' and position + 1 < len(buffer) and buffer[position + 1].isdigit():
+            lookahead = position + 1
+            while lookahead < len(buffer) and buffer[lookahead].isdigit():
+                lookahead += 1
+            if lookahead == len(buffer) and not eof:
+                consumed += position
+                buffer, position, eof = _refill(stream, buffer, position, chunk_size)
+                continue
+            token_class = TokenClass.NUMERO
+        else:
+            best, lookahead, hit_end = table.scan(buffer, position)
+            if hit_end and not eof:
+                consumed += position
+                buffer, position, eof = _refill(stream, buffer, position, chunk_size)
+                continue
+            if best == no_match:
+                raise SyntaxError(f"Erro léxico na linha {current_line}, coluna {current_column}: caractere inesperado: {buffer[position]!r}")
+            token_class = table.token_classes[best]
+
+        lexeme = buffer[position:lookahead]
+        if token_class not in (TokenClass.ESPACO_EM_BRANCO, TokenClass.COMENTARIO):
+            yield Token(token_class, lexeme, current_line, current_column, consumed + position)
+
+        current_line, current_column = advance_position(buffer, position, lookahead, current_line, current_column)
+        position = lookahead
+
+
+def _refill(stream, buffer, position, chunk_size):
+    """Descarta o que já foi consumido e acrescenta o próximo bloco ao buffer."""
+    chunk = stream.read(chunk_size)
+    return buffer[position:] + chunk, 0, not chunk
@@ -0,0 +1,138 @@
+from array import array
+
+DEAD = -1
+
+def _equivalence_classes(transitions, alphabet):
+    """Agrupa símbolos com o mesmo comportamento em todos os estados.
+
+    A classe 0 é reservada para símbolos sem nenhuma transição."""
+    signatures = {}
+    classes = {}
+    for symbol in sorted(alphabet):
+        signature = tuple(table.get(symbol, DEAD) for table in transitions)
+        if all(destine == DEAD for destine in signature):
+            continue
+        if signature not in signatures:
+            signatures[signature] = len(signatures) + 1
+        classes[symbol] = signatures[signature]
+    return classes, len(signatures) + 1
+
+
+class DFATable:
+    """Representação densa de um AFD determinístico.
+
+    Estados são inteiros (o inicial é 0), símbolos são mapeados para classes
+    de equivalência e as transições ficam em uma matriz plana `delta`
+    (estado * num_classes + classe), com DEAD (-1) onde não há transição."""
+
+    __slots__ = ('num_states', 'num_classes', 'classes', 'ascii_classes', 'delta', 'final', 'initial')
+
+    def __init__(self, transitions, finals, alphabet):
+        self.classes, self.num_classes = _equivalence_classes(transitions, alphabet)
+        self.num_states = len(transitions)
+        self.initial = 0
+
+        ascii_classes = bytearray(128)
+        for symbol, symbol_class in self.classes.items():
+            if len(symbol) == 1 and ord(symbol) < 128:
+                ascii_classes[ord(symbol)] = symbol_class
+        self.ascii_classes = bytes(ascii_classes)
+
+        typecode = 'h' if self.num_states < 2 ** 15 else 'i'
+        delta = array(typecode, [DEAD]) * (self.num_states * self.num_classes)
+        for state, table in enumerate(transitions):
+            row = state * self.num_classes
+            for symbol, destine in table.items():
+                delta[row + self.classes[symbol]] = destine
+        self.delta = delta
+        self.final = bytes(1 if state in finals else 0 for state in range(self.num_states))
+
+    def class_of(self, symbol):
+        code_point = ord(symbol)
+        if code_point < 128:
+            return self.ascii_classes[code_point]
+        return self.classes.get(symbol, 0)
+
+    def step(self, state, symbol):
+        return self.delta[state * self.num_classes + self.class_of(symbol)]
+
+    def run(self, word, state=0):
+        """Estado alcançado após ler `word` a partir de `state`, ou DEAD."""
+        delta = self.delta
+        num_classes = self.num_classes
+        class_of = self.class_of
+        for symbol in word:
+            state = delta[state * num_classes + class_of(symbol)]
+            if state == DEAD:
+                break
+        return state
+
+    def accepts(self, word):
+        state = self.run(word)
+        return state != DEAD and self.final[state] == 1
+
+    def nbytes(self):
+        """Memória ocupada pelas estruturas da tabela, em bytes."""
+        return (self.delta.itemsize * len(self.delta) + len(self.final) + len(self.ascii_classes)
+                + 2 * len(self.classes))
+
+
+class UnionTable(DFATable):
+    """DFATable do autômato união, com os rótulos de prioridade de cada estado."""
+
+    __slots__ = ('token_classes', 'tags', 'live', 'no_class')
+
+    def __init__(self, transitions, token_classes, tags, live):
+        self.token_classes = tuple(token_classes)
+        self.no_class = len(self.token_classes) + 1
+        alphabet = set().union(*(table.keys() for table in transitions))
+        finals = {state for state, tag in enumerate(tags) if tag != self.no_class}
+        super().__init__(transitions, finals, alphabet)
+        self.tags = bytes(tags)
+        self.live = bytes(live)
+
+    def match(self, code, position):
+        """Mesma semântica de UnionAFD.match, sobre a matriz densa."""
+        best, end, _ = self.scan(code, position)
+        if best == len(self.token_classes):
+            return None, position
+        return self.token_classes[best], end
+
+    def scan(self, code, position):
+        """Percorre `code` a partir de `position` como em match.
+
+        Retorna (índice da classe, fim, chegou_ao_fim): o índice é
+        len(token_classes) quando nada foi reconhecido e chegou_ao_fim indica
+        que a leitura parou apenas porque `code` acabou, ou seja, com mais
+        entrada o token ainda poderia crescer."""
+        delta = self.delta
+        num_classes = self.num_classes
+        ascii_classes = self.ascii_classes
+        classes = self.classes
+        tags = self.tags
+        live = self.live
+        no_match = len(self.token_classes)
+        length = len(code)
+        state = 0
+        best = no_match
+        end = position
+        lookahead = position
+        while lookahead < length:
+            symbol = code[lookahead]
+            code_point = ord(symbol)
+            symbol_class = ascii_classes[code_point] if code_point < 128 else classes.get(symbol, 0)
+            state = delta[state * num_classes + symbol_class]
+            if state == DEAD:
+                break
+            lookahead += 1
+            if tags[state] <= best:
+                best = tags[state]
+                end = lookahead
+            if live[state] > best:
+                break
+        else:
+            return best, end, True
+        return best, end, False
+
+    def nbytes(self):
+        return super().nbytes() + len(self.tags) + len(self.live)
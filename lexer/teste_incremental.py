@@ -0,0 +1,69 @@
+"""Teste diferencial de relex(): aplica edições aleatórias a textos pequenos
+e a um programa sintético e compara o resultado com o lexer completo
+(classe, valor, linha, coluna e offset de cada token).
+
+    python -m lexer.teste_incremental [--edits N] [--seed S]
+"""
+
+import random
+from benchmarks.workload import WorkloadParams, generate_program
+from lexer.lexer import lexer
+from lexer.incremental import relex
+
+# Trechos que exercitam os casos de fronteira do lexer (números com '.',
+# comentários, strings, palavras reservadas como prefixo de identificadores)
+PIECES = list('abc01 .\n-+=<>#";(){}') + ['##x', '"s s"', '1.', 'let', 'letx', 'createWindow', '--', '-1']
+
+def _key(tokens):
+    return [(t.token_class, t.token_value, t.line, t.column, t.offset) for t in tokens]
+
+def _random_edit(rng, text, pieces):
+    offset = rng.randint(0, len(text))
+    removed = rng.randint(0, min(4, len(text) - offset))
+    inserted = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+    return offset, removed, inserted
+
+def check(edits=10000, seed=0):
+    """Retorna (edições comparadas, divergências), onde cada divergência é
+    (texto, edição, tokens_de_relex, tokens_do_lexer_completo)."""
+    rng = random.Random(seed)
+    program = generate_program(WorkloadParams(elements=12, click_handlers=3, keypress_handlers=2, variables=4))
+    checked = 0
+    mismatches = []
+    for index in range(edits):
+        if index % 10 == 0:
+            # relex altera os tokens reaproveitados, então cada edição parte de uma lista nova
+            text, tokens = program, lexer(program)
+        else:
+            text = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 30)))
+            try:
+                tokens = lexer(text)
+            except SyntaxError:
+                continue
+        edit = _random_edit(rng, text, PIECES)
+        offset, removed, inserted = edit
+        new_text = text[:offset] + inserted + text[offset + removed:]
+        try:
+            expected = _key(lexer(new_text))
+        except SyntaxError:
+            continue
+        got, _ = relex(tokens, edit, new_text)
+        checked += 1
+        if _key(got) != expected:
+            mismatches.append((text, edit, _key(got), expected))
+    return checked, mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compara relex() com o lexer completo")
+    arg_parser.add_argument('--edits', type=int, default=10000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    checked, mismatches = check(args.edits, args.seed)
+    for text, edit, got, expected in mismatches[:3]:
+        print(f"Divergência: texto={text!r} edição={edit}\n  relex:    {got}\n  completo: {expected}")
+    print(f"{checked} edições comparadas, {len(mismatches)} divergências")
+    raise SystemExit(1 if mismatches else 0)
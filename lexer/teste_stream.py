@@ -0,0 +1,59 @@
+"""Teste diferencial de lexer_stream(): tokeniza os programas de testes/ e um
+programa sintético lendo em blocos pequenos, para que strings, comentários,
+números e o '-' dos números negativos atravessem o fim dos blocos, e compara
+com lexer() (classe, valor, linha, coluna e offset de cada token).
+
+    python -m lexer.teste_stream [--chunk-sizes N ...]
+"""
+
+import glob
+import io
+import os
+from benchmarks.workload import WorkloadParams, generate_program
+from lexer.lexer import lexer
+from lexer.stream import lexer_stream
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'testes')
+
+def _outcome(tokenize):
+    try:
+        return [(t.token_class, t.token_value, t.line, t.column, t.offset) for t in tokenize()]
+    except SyntaxError as e:
+        return str(e)
+
+def _sources():
+    sources = []
+    for path in sorted(glob.glob(os.path.join(TEST_DIR, '*.simpleui'))):
+        with open(path, encoding='utf-8') as file:
+            sources.append((os.path.basename(path), file.read()))
+    program = generate_program(WorkloadParams(elements=12, click_handlers=3, keypress_handlers=2, variables=4))
+    sources.append(('sintético', program))
+    return sources
+
+def check(chunk_sizes=(1, 2, 3, 7)):
+    """Retorna (comparações feitas, divergências), onde cada divergência é
+    (nome_do_programa, tamanho_do_bloco)."""
+    checked = 0
+    mismatches = []
+    for name, code in _sources():
+        expected = _outcome(lambda: lexer(code))
+        for chunk_size in chunk_sizes:
+            got = _outcome(lambda: list(lexer_stream(io.StringIO(code), chunk_size)))
+            checked += 1
+            if got != expected:
+                mismatches.append((name, chunk_size))
+    return checked, mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compara lexer_stream com o lexer completo")
+    arg_parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1, 2, 3, 7])
+    args = arg_parser.parse_args()
+
+    checked, mismatches = check(args.chunk_sizes)
+    for name, chunk_size in mismatches:
+        print(f"Divergência em {name} com blocos de {chunk_size} caracteres")
+    print(f"{checked} comparações, {len(mismatches)} divergências")
+    raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,118 @@
+from array import array
+from lexer.my_token import TokenClass
+from lexer.lexer import scan_tokens, SKIPPED_CLASSES
+
+TOKEN_CLASSES = tuple(TokenClass)
+CLASS_IDS = {token_class: index for index, token_class in enumerate(TOKEN_CLASSES)}
+
+class TokenView:
+    """Visão de um token de um TokenStream com a mesma interface de Token.
+
+    O lexema só é extraído do texto original quando `token_value` é lido."""
+
+    __slots__ = ('_stream', '_index')
+
+    def __init__(self, stream, index):
+        self._stream = stream
+        self._index = index
+
+    @property
+    def token_class(self):
+        return TOKEN_CLASSES[self._stream.classes[self._index]]
+
+    @property
+    def token_value(self):
+        return self._stream.lexeme(self._index)
+
+    @property
+    def line(self):
+        return self._stream.lines[self._index]
+
+    @property
+    def column(self):
+        return self._stream.columns[self._index]
+
+    @property
+    def offset(self):
+        return self._stream.starts[self._index]
+
+    def __str__(self):
+        return f'Classe do Token: {self.token_class.name}, Valor: {self.token_value}, Linha: {self.line}, Coluna: {self.column}'
+
+
+class TokenStream:
+    """Sequência de tokens guardada em arrays paralelos sobre o texto original.
+
+    Para cada token são guardados o id da classe (índice em TokenClass), o
+    início e o tamanho do lexema em `source`, a linha e a coluna. Indexar ou
+    iterar devolve TokenViews, então a sequência pode ser passada ao Parser
+    no lugar da lista de Tokens."""
+
+    __slots__ = ('source', 'classes', 'starts', 'lengths', 'lines', 'columns')
+
+    def __init__(self, source):
+        self.source = source
+        self.classes = array('B')
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+
+    @classmethod
+    def from_code(cls, code):
+        stream = cls(code)
+        classes = stream.classes.append
+        starts = stream.starts.append
+        lengths = stream.lengths.append
+        lines = stream.lines.append
+        columns = stream.columns.append
+        for token_class, start, end, line, column in scan_tokens(code):
+            if token_class in SKIPPED_CLASSES:
+                continue
+            classes(CLASS_IDS[token_class])
+            starts(start)
+            lengths(end - start)
+            lines(line)
+            columns(column)
+        return stream
+
+    def append(self, token_class, start, length, line, column):
+        self.classes.append(CLASS_IDS[token_class])
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def lexeme(self, index):
+        """Lexema do token `index`: fatia de `source`, ou memoryview se `source` for bytes."""
+        start = self.starts[index]
+        end = start + self.lengths[index]
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            return memoryview(self.source)[start:end]
+        return self.source[start:end]
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de token fora do intervalo")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TokenView(self, index)
+
+    def nbytes(self):
+        """Memória dos arrays de tokens, sem contar o texto original."""
+        return sum(column.itemsize * len(column) for column in
+                   (self.classes, self.starts, self.lengths, self.lines, self.columns))
+
+
+def lexer_token_stream(code):
+    """Como lexer(), mas devolve um TokenStream em vez de uma lista de Tokens."""
+    return TokenStream.from_code(code)
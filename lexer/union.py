@@ -0,0 +1,140 @@
+from types import MappingProxyType
+from lexer.table import UnionTable
+from lexer.minimize import hopcroft, count_transitions
+
+class UnionAFD:
+    """Autômato produto que reconhece todas as classes de token em uma só passada.
+
+    Cada estado carrega um rótulo (`tags`) com o índice da classe de maior
+    prioridade que aceita naquele ponto e, em `live`, o índice da classe de
+    maior prioridade que ainda pode aceitar mais adiante. A prioridade é a
+    ordem de `token_classes`, a mesma do dicionário automata_functions."""
+
+    __slots__ = ('token_classes', 'transitions', 'tags', 'live', 'initial', 'no_class')
+
+    def __init__(self, token_classes, transitions, tags, live):
+        object.__setattr__(self, 'token_classes', tuple(token_classes))
+        object.__setattr__(self, 'transitions', tuple(MappingProxyType(dict(t)) for t in transitions))
+        object.__setattr__(self, 'tags', tuple(tags))
+        object.__setattr__(self, 'live', tuple(live))
+        object.__setattr__(self, 'initial', 0)
+        # Índice usado em tags/live quando nenhuma classe aceita (ou continua viva)
+        object.__setattr__(self, 'no_class', len(self.token_classes) + 1)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UnionAFD é imutável")
+
+    def __len__(self):
+        return len(self.transitions)
+
+    def to_table(self):
+        """Exporta o autômato como UnionTable, a forma usada pelo lexer."""
+        return UnionTable(self.transitions, self.token_classes, self.tags, self.live)
+
+    def minimize(self):
+        """Retorna (union_minimo, estatisticas), preservando os rótulos de cada estado."""
+        labels = list(zip(self.tags, self.live))
+        alphabet = set().union(*(table.keys() for table in self.transitions))
+        transitions, representatives = hopcroft(self.transitions, labels, alphabet, (self.no_class, self.no_class))
+        minimal = UnionAFD(
+            self.token_classes,
+            transitions,
+            [self.tags[state] for state in representatives],
+            [self.live[state] for state in representatives],
+        )
+        stats = {
+            "states_before": len(self),
+            "states_after": len(minimal),
+            "transitions_before": count_transitions(self.transitions),
+            "transitions_after": count_transitions(minimal.transitions),
+        }
+        return minimal, stats
+
+    def match(self, code, position):
+        """Reconhece o token que começa em `position`.
+
+        Retorna (token_class, fim) ou (None, position) se nenhuma classe aceita.
+        Vale a classe de maior prioridade que aceita algum prefixo e, dentro
+        dela, o prefixo mais longo, exatamente como no lexer classe a classe."""
+        transitions = self.transitions
+        tags = self.tags
+        live = self.live
+        length = len(code)
+        state = self.initial
+        best = len(self.token_classes)
+        end = position
+        lookahead = position
+        while lookahead < length:
+            state = transitions[state].get(code[lookahead])
+            if state is None:
+                break
+            lookahead += 1
+            if tags[state] <= best:
+                best = tags[state]
+                end = lookahead
+            if live[state] > best:
+                break
+        if best == len(self.token_classes):
+            return None, position
+        return self.token_classes[best], end
+
+
+def _coaccessible(afd):
+    """Estados de um FrozenAFD a partir dos quais algum estado final é alcançável."""
+    reverse = [[] for _ in range(len(afd))]
+    for origin, table in enumerate(afd.transitions):
+        for destine in table.values():
+            reverse[destine].append(origin)
+    useful = set(afd.finals)
+    pending = list(useful)
+    while pending:
+        state = pending.pop()
+        for origin in reverse[state]:
+            if origin not in useful:
+                useful.add(origin)
+                pending.append(origin)
+    return useful
+
+
+def build_union(automata):
+    """Combina os FrozenAFD de cada TokenClass (na ordem do mapeamento) em um UnionAFD.
+
+    Componentes que não podem mais aceitar são descartados, o que mantém o
+    número de estados do produto pequeno."""
+    token_classes = list(automata)
+    components = [automata[token_class] for token_class in token_classes]
+    useful = [_coaccessible(afd) for afd in components]
+    alphabet = sorted(set().union(*(afd.alphabet for afd in components)))
+    no_class = len(token_classes) + 1
+
+    def normalize(states):
+        return tuple(s if s is not None and s in useful[i] else None for i, s in enumerate(states))
+
+    initial = normalize([afd.initial for afd in components])
+    index = {initial: 0}
+    order = [initial]
+    transitions = []
+    for states in order:
+        table = {}
+        for symbol in alphabet:
+            next_states = normalize([
+                components[i].transitions[s].get(symbol) if s is not None else None
+                for i, s in enumerate(states)
+            ])
+            if all(s is None for s in next_states):
+                continue
+            if next_states not in index:
+                index[next_states] = len(order)
+                order.append(next_states)
+            table[symbol] = index[next_states]
+        transitions.append(table)
+
+    tags = []
+    live = []
+    for states in order:
+        accepting = [i for i, s in enumerate(states) if s is not None and s in components[i].finals]
+        alive = [i for i, s in enumerate(states) if s is not None]
+        tags.append(accepting[0] if accepting else no_class)
+        live.append(alive[0] if alive else no_class)
+
+    return UnionAFD(token_classes, transitions, tags, live)
@@ -1,73 +1,379 @@
 import os
+import io
 import json
-from lexer.lexer import lexer
-from utils.helpers import read_file
+import argparse
+import contextlib
+import time
+import traceback
+import cProfile
+from concurrent.futures import ProcessPoolExecutor
+from lexer.backends import LEXER_BACKENDS, DEFAULT_BACKEND, get_lexer, differential_check
+from utils.helpers import read_file, write_if_changed, write_stream_if_changed
+from utils.build_cache import BuildCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from utils.artifacts import ARTIFACT_FORMATS, DEFAULT_FORMAT, artifact_filename, dumps_artifact
+from utils.profiling import PROFILE_MODES, PhaseProfiler, NullProfiler, count_ast_nodes, count_symbols
 from parser.parser import Parser
+from parser.ast_graph import write_ast_dot, render_ast_dot, AstRenderer
 from analisador_semantico.semantic import SemanticAnalyzer
 from tradutor.ctranslator import GtkTranslator 
 
-def process_test_files():
-    test_dir = "testes"
-    test_files = [f for f in os.listdir(test_dir) if f.endswith('.simpleui')]
-    
-    if not test_files:
-        print("Nenhum arquivo de teste encontrado.")
-        return
+# Status em que a compilação parou antes de gravar o .dot da AST
+NO_AST_STATUSES = ("erro_lexico", "erro_sintaxe", "erro_interno")
+
+class CompileOptions:
+    """Opções que valem para todos os arquivos de uma execução."""
+
+    def __init__(self, lexer_backend=DEFAULT_BACKEND, lexer_diff=False, render_ast=False,
+                 quiet=False, artifact_format=DEFAULT_FORMAT, profile=None):
+        self.lexer_backend = lexer_backend
+        self.lexer_diff = lexer_diff
+        self.render_ast = render_ast
+        self.quiet = quiet
+        self.artifact_format = artifact_format
+        self.profile = profile
+
+    def cache_key(self):
+        """Opções que mudam os artefatos ou a saída de console. Os lexers dão os
+        mesmos tokens, então o escolhido só conta com --lexer-diff, cuja
+        saída compara o lexer escolhido com outro."""
+        lexer_diff = self.lexer_backend if self.lexer_diff else False
+        return (lexer_diff, self.render_ast, self.quiet, self.artifact_format)
+
+def _init_worker(lexer_backend):
+    """Inicializa um processo do pool: constrói os autômatos (ou carrega o
+    scanner gerado) uma vez, e eles ficam prontos para todos os arquivos que
+    o processo compilar."""
+    get_lexer(lexer_backend)("")
+
+def compile_file(test_dir, test_file, options, cache=None):
+    """Compila um arquivo .simpleui e devolve (saída, status).
+
+    A saída de console é capturada em vez de impressa, para que o modo em lote
+    possa exibi-la na ordem dos arquivos. O status é "ok", "erro_lexico",
+    "erro_sintaxe", "erro_semantico" ou "erro_interno"."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        status = _compile_reporting_errors(test_dir, test_file, get_lexer(options.lexer_backend), options, cache)
+    return output.getvalue(), status
+
+def _compile_reporting_errors(test_dir, test_file, lexer, options, cache=None):
+    """Como _compile_file, mas um erro léxico vira o status "erro_lexico", e
+    qualquer outra falha o status "erro_interno" (com o traceback), em vez
+    de interromper os demais arquivos ou o modo watch."""
+    try:
+        return _compile_file(test_dir, test_file, lexer, options, cache)
+    except SyntaxError as e:
+        print(f"Erro léxico ao processar {test_file}: {e}")
+        return "erro_lexico"
+    except Exception:
+        print(f"Erro interno ao processar {test_file}:")
+        print(traceback.format_exc(), end='')
+        return "erro_interno"
+
+def _compile_file(test_dir, test_file, lexer, options, cache=None):
+    """Compila um arquivo, usando o cache de artefatos quando houver um.
+
+    Num acerto, os artefatos e a saída de console guardados são restaurados
+    sem executar nenhuma fase do compilador. Com --profile o cache não é
+    usado, já que o objetivo é medir as fases."""
+    full_path = os.path.join(test_dir, test_file)
+    print(f"\nProcessando arquivo: {test_file}")
     
-    for test_file in test_files:
-        full_path = os.path.join(test_dir, test_file)
-        print(f"\nProcessando arquivo: {test_file}")
-        
-        code = read_file(full_path)
-        tokens = lexer(code)
-        
-        print("\nTokens gerados pelo lexer:")
-        for token in tokens:
-            print(f'{token.token_class.name:<20} {token.token_value:<20} (Linha: {token.line}, Coluna: {token.column})')
-        
-        parser = Parser(tokens)
+    code = read_file(full_path)
+
+    if options.profile == "json":
+        profiler = PhaseProfiler()
+        try:
+            status = _run_profiled(test_file, code, lexer, options, profiler)
+        finally:
+            profiler.stop()
+        profiler.dump(f'profile-{test_file}.json')
+        print(f"Perfil das fases salvo em profile-{test_file}.json")
+        return status
+    if options.profile == "cprofile":
+        profile = cProfile.Profile()
+        try:
+            status = profile.runcall(_run_profiled, test_file, code, lexer, options)
+        finally:
+            profile.dump_stats(f'profile-{test_file}.prof')
+        print(f"Perfil (cProfile) salvo em profile-{test_file}.prof")
+        return status
+
+    if cache is None:
+        return _run_phases(test_file, code, lexer, options, [])
+
+    # O nome do arquivo aparece nos artefatos e na saída, então faz parte da chave
+    key = cache.key(code, test_file, *options.cache_key())
+    hit = cache.restore(key)
+    if hit is not None:
+        console, status = hit
+        print(console, end='')
+        return status
+
+    artifacts = []
+    console = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(console):
+            status = _run_phases(test_file, code, lexer, options, artifacts)
+    finally:
+        print(console.getvalue(), end='')
+    cache.store(key, console.getvalue(), status, artifacts)
+    return status
+
+def _run_profiled(test_file, code, lexer, options, profiler=NullProfiler()):
+    """_run_phases para --profile: com --render-ast, a imagem da AST é gerada
+    aqui mesmo, na fase "render", em vez de em segundo plano (fora da medida).
+    O AstRenderer depois a encontra pronta e não a refaz."""
+    status = _run_phases(test_file, code, lexer, options, [], profiler)
+    if options.render_ast and status not in NO_AST_STATUSES:
+        filename = f"output-{test_file}"
         try:
+            with profiler.phase("render"):
+                render_ast_dot(filename)
+        except Exception as e:
+            print(f"Falha ao gerar {filename}.png: {e}")
+    return status
+
+def _write_artifact(filename, content, artifacts, profiler):
+    data = content.encode() if isinstance(content, str) else content
+    # Arquivos sem mudança não são regravados e contam 0 bytes
+    profiler.count("bytes_written", len(data) if write_if_changed(filename, data) else 0)
+    artifacts.append(filename)
+
+def _run_phases(test_file, code, lexer, options, artifacts, profiler=NullProfiler()):
+    """Executa lexer, parser, análise semântica e tradução, registrando em
+    `artifacts` os arquivos gerados. Com `render_ast`, grava também o .dot da
+    AST; a imagem é gerada depois, fora desta função (ver AstRenderer). Com
+    `quiet`, tokens, AST e tabela de símbolos não são impressos. As fases são
+    medidas por `profiler` (ver utils.profiling)."""
+    lexer_backend = options.lexer_backend
+
+    if options.lexer_diff:
+        reference = "regex" if lexer_backend == DEFAULT_BACKEND else DEFAULT_BACKEND
+        mismatches = differential_check(code, (reference, lexer_backend))
+        if mismatches:
+            print(f"\nDivergência entre os lexers {reference} e {lexer_backend}:")
+            for mismatch in mismatches:
+                print(json.dumps(mismatch, indent=4, ensure_ascii=False))
+        else:
+            print(f"\nLexers {reference} e {lexer_backend} produziram os mesmos tokens.")
+
+    with profiler.phase("lexer"):
+        tokens = lexer(code)
+    profiler.count("tokens", len(tokens))
+    
+    if not options.quiet:
+        with profiler.phase("console"):
+            print("\nTokens gerados pelo lexer:")
+            for token in tokens:
+                print(f'{token.token_class.name:<20} {token.token_value:<20} (Linha: {token.line}, Coluna: {token.column})')
+    
+    parser = Parser(tokens)
+    try:
+        with profiler.phase("parser"):
             ast = parser.parse()
-            print("\nAST gerada pelo parser:")
-            print(json.dumps(ast, indent=4))
-            
-            output_filename = f"output-{test_file}"
-            parser.generate_ast_graph(ast, output_filename)
+        profiler.count("ast_nodes", count_ast_nodes(ast))
+        if not options.quiet:
+            with profiler.phase("console"):
+                print("\nAST gerada pelo parser:")
+                print(json.dumps(ast, indent=4))
+        
+        with profiler.phase("write"):
+            if options.render_ast:
+                output_filename = f"output-{test_file}"
+                written = write_ast_dot(ast, output_filename)
+                profiler.count("bytes_written", os.path.getsize(output_filename) if written else 0)
+                # Só o .dot vai para o cache: a imagem é gerada depois, em segundo
+                # plano, e o AstRenderer a refaz a partir do .dot restaurado
+                artifacts.append(output_filename)
+                print(f"Grafo da AST salvo em {output_filename}")
 
-            with open(f'output-{test_file}.json', 'w') as f:
-                json.dump(ast, f, indent=4)
+            ast_output_file = artifact_filename(f'output-{test_file}', options.artifact_format)
+            _write_artifact(ast_output_file, dumps_artifact(ast, options.artifact_format), artifacts, profiler)
 
-            print("\nExecutando Análise Semântica...")
-            semantic_analyzer = SemanticAnalyzer()   
-            try:
+        print("\nExecutando Análise Semântica...")
+        semantic_analyzer = SemanticAnalyzer()   
+        try:
+            with profiler.phase("semantic"):
                 symbol_table = semantic_analyzer.analyze(ast)
-                print("Análise semântica concluída com sucesso!")
+            profiler.count("symbols", count_symbols(symbol_table))
+            print("Análise semântica concluída com sucesso!")
 
-                print("\nTabela de símbolos gerada:")
-                print(json.dumps(symbol_table, indent=4))
+            if not options.quiet:
+                with profiler.phase("console"):
+                    print("\nTabela de símbolos gerada:")
+                    print(json.dumps(symbol_table, indent=4))
 
-                print("\nGerando código GTK...")
+            print("\nGerando código GTK...")
+            gtk_output_file = f'output-{test_file}.c'
+            # O código C vai direto para o disco enquanto é gerado, então esta
+            # fase inclui a gravação
+            with profiler.phase("translator"):
                 gtk_translator = GtkTranslator(symbol_table)
-                gtk_code = gtk_translator.translate()
-                
-                gtk_output_file = f'output-{test_file}.c'
-                with open(gtk_output_file, 'w') as f:
-                    f.write(gtk_code)
-                
-                print(f"Código GTK gerado e salvo em {gtk_output_file}")
-                
-                compile_command = f"gcc `pkg-config --cflags gtk+-3.0` -o {test_file.replace('.simpleui', '')} {gtk_output_file} `pkg-config --libs gtk+-3.0`"
-                print("\nPara compilar o código gerado, execute:")
-                print(compile_command)
-                
-                with open(f'symbol_table-{test_file}.json', 'w') as f:
-                    json.dump(symbol_table, f, indent=4)
-                
-            except ValueError as ve:
-                print(f"Erro semântico ao processar {test_file}: {ve}")
+                written = write_stream_if_changed(gtk_output_file, gtk_translator.write)
+            profiler.count("c_lines", gtk_translator.line_count)
+            profiler.count("bytes_written", os.path.getsize(gtk_output_file) if written else 0)
+            artifacts.append(gtk_output_file)
+            
+            print(f"Código GTK gerado e salvo em {gtk_output_file}")
+            
+            compile_command = f"gcc `pkg-config --cflags gtk+-3.0` -o {test_file.replace('.simpleui', '')} {gtk_output_file} `pkg-config --libs gtk+-3.0`"
+            print("\nPara compilar o código gerado, execute:")
+            print(compile_command)
             
-        except SyntaxError as e:
-            print(f"Erro de sintaxe ao processar {test_file}: {e}")
+            symbol_table_file = artifact_filename(f'symbol_table-{test_file}', options.artifact_format)
+            with profiler.phase("write"):
+                _write_artifact(symbol_table_file, dumps_artifact(symbol_table, options.artifact_format), artifacts, profiler)
+            
+        except ValueError as ve:
+            print(f"Erro semântico ao processar {test_file}: {ve}")
+            return "erro_semantico"
+        
+    except SyntaxError as e:
+        print(f"Erro de sintaxe ao processar {test_file}: {e}")
+        return "erro_sintaxe"
+    return "ok"
+
+def _list_test_files(test_dir):
+    return sorted(f for f in os.listdir(test_dir) if f.endswith('.simpleui'))
+
+def process_test_files(options=None, jobs=1, cache=None):
+    options = options or CompileOptions()
+    test_dir = "testes"
+    test_files = _list_test_files(test_dir)
+    
+    if not test_files:
+        print("Nenhum arquivo de teste encontrado.")
+        return
+
+    # As imagens da AST são geradas em segundo plano enquanto os próximos
+    # arquivos são compilados; só o fim da execução espera por elas.
+    renderer = AstRenderer() if options.render_ast else None
+
+    if jobs <= 1:
+        lexer = get_lexer(options.lexer_backend)
+        for test_file in test_files:
+            status = _compile_reporting_errors(test_dir, test_file, lexer, options, cache)
+            if renderer is not None and status not in NO_AST_STATUSES:
+                renderer.submit(f"output-{test_file}")
+        if cache is not None:
+            cache.evict()
+        _finish_rendering(renderer)
+        return
+
+    # Modo em lote: cada processo compila arquivos inteiros e devolve a saída
+    # capturada; map() entrega os resultados na ordem de test_files.
+    statuses = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options.lexer_backend,)) as executor:
+        results = executor.map(compile_file, [test_dir] * len(test_files), test_files,
+                               [options] * len(test_files), [cache] * len(test_files),
+                               chunksize=max(1, len(test_files) // (jobs * 4)))
+        for test_file, (output, status) in zip(test_files, results):
+            print(output, end='')
+            statuses[test_file] = status
+            if renderer is not None and status not in NO_AST_STATUSES:
+                renderer.submit(f"output-{test_file}")
+    if cache is not None:
+        cache.evict()
+
+    failed = [test_file for test_file, status in statuses.items() if status != "ok"]
+    print(f"\n{len(test_files)} arquivos compilados com {jobs} processos: "
+          f"{len(test_files) - len(failed)} sem erros, {len(failed)} com erros.")
+    for test_file in failed:
+        print(f"  {test_file}: {statuses[test_file]}")
+    _finish_rendering(renderer)
+
+def _finish_rendering(renderer, close=True):
+    if renderer is None:
+        return
+    rendered, skipped, failures = renderer.wait()
+    if close:
+        renderer.close()
+    print(f"\nGrafos da AST: {rendered} imagens geradas, {skipped} reaproveitadas (.dot sem mudanças).")
+    for filename, message in failures:
+        print(f"Falha ao gerar {filename}.png: {message}")
+
+def _snapshot(test_dir):
+    """(mtime, tamanho) de cada arquivo .simpleui de `test_dir`."""
+    snapshot = {}
+    for test_file in _list_test_files(test_dir):
+        try:
+            stat = os.stat(os.path.join(test_dir, test_file))
+        except FileNotFoundError:
+            continue
+        snapshot[test_file] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def watch_test_files(options=None, cache=None, interval=0.5):
+    """Modo residente: compila tudo uma vez e depois consulta mtime e tamanho
+    dos arquivos a cada `interval` segundos, recompilando só os que mudaram
+    (no mesmo processo, com os autômatos já construídos). Informa a latência
+    de cada recompilação. Termina com Ctrl+C."""
+    options = options or CompileOptions()
+    test_dir = "testes"
+    process_test_files(options, 1, cache)
+    snapshot = _snapshot(test_dir)
+    lexer = get_lexer(options.lexer_backend)
+    renderer = AstRenderer() if options.render_ast else None
+    print(f"\nObservando {len(snapshot)} arquivos em {test_dir}/ (Ctrl+C para sair)...")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(test_dir)
+            for test_file in sorted(set(snapshot) - set(current)):
+                print(f"\n[watch] {test_file} removido")
+            changed = [test_file for test_file in sorted(current) if snapshot.get(test_file) != current[test_file]]
+            snapshot = current
+            for test_file in changed:
+                start = time.perf_counter()
+                status = _compile_reporting_errors(test_dir, test_file, lexer, options, cache)
+                latency = (time.perf_counter() - start) * 1000
+                if renderer is not None and status not in NO_AST_STATUSES:
+                    renderer.submit(f"output-{test_file}")
+                print(f"[watch] {test_file} recompilado em {latency:.1f} ms ({status})")
+            if changed:
+                if cache is not None:
+                    cache.evict()
+                _finish_rendering(renderer, close=False)
+    except KeyboardInterrupt:
+        print("\nModo watch encerrado.")
+    finally:
+        if renderer is not None:
+            renderer.close()
 
 if __name__ == '__main__':
-    process_test_files()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Compilador SimpleUI para C + GTK")
+    arg_parser.add_argument('--lexer', choices=LEXER_BACKENDS, default=DEFAULT_BACKEND,
+                            help="implementação do analisador léxico")
+    arg_parser.add_argument('--lexer-diff', action='store_true',
+                            help="compara os tokens do lexer escolhido com os de outro lexer")
+    arg_parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                            help="compila os arquivos em N processos (padrão: 1, sequencial)")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="recompila todos os arquivos, sem usar o cache de artefatos")
+    arg_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                            help=f"diretório do cache de artefatos (padrão: {DEFAULT_CACHE_DIR})")
+    arg_parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                            help="tamanho máximo do cache; as entradas usadas há mais tempo são removidas")
+    arg_parser.add_argument('--render-ast', action='store_true',
+                            help="gera o grafo da AST (.dot e .png) de cada arquivo, em segundo plano")
+    arg_parser.add_argument('--quiet', '-q', action='store_true',
+                            help="não imprime tokens, AST e tabela de símbolos")
+    arg_parser.add_argument('--artifact-format', choices=ARTIFACT_FORMATS, default=DEFAULT_FORMAT,
+                            help="formato da AST e da tabela de símbolos salvas (padrão: json indentado)")
+    arg_parser.add_argument('--profile', choices=PROFILE_MODES,
+                            help="mede cada arquivo: relatório JSON por fase (tempo, pico de memória, "
+                                 "contadores) ou dump do cProfile; desativa o cache")
+    arg_parser.add_argument('--watch', action='store_true',
+                            help="fica residente e recompila os arquivos que mudarem")
+    arg_parser.add_argument('--watch-interval', type=float, default=0.5, metavar='SEGUNDOS',
+                            help="intervalo entre as verificações do modo watch (padrão: 0.5)")
+    args = arg_parser.parse_args()
+    cache = None if args.no_cache else BuildCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    options = CompileOptions(args.lexer, args.lexer_diff, args.render_ast, args.quiet, args.artifact_format,
+                             args.profile)
+    if args.watch:
+        watch_test_files(options, cache, args.watch_interval)
+    else:
+        process_test_files(options, args.jobs, cache)
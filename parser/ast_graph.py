@@ -0,0 +1,94 @@
+"""Grafo da AST (Graphviz). O pacote graphviz só é importado quando um grafo
+é de fato montado ou renderizado, para não pesar na inicialização."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from utils.helpers import write_if_changed
+
+def build_ast_graph(ast):
+    """Monta o Digraph da AST. Os nós recebem IDs sequenciais (n0, n1, ...)
+    na ordem da travessia, então ASTs iguais geram fontes .dot idênticas."""
+    import graphviz
+
+    dot = graphviz.Digraph(comment='AST')
+    counter = 0
+
+    def new_id():
+        nonlocal counter
+        node_id = f'n{counter}'
+        counter += 1
+        return node_id
+
+    def add_nodes_recursive(node, parent_id=None):
+        node_id = new_id()
+        if isinstance(node, dict):
+            label = node.get("type", "node")
+            dot.node(node_id, label)
+            if parent_id:
+                dot.edge(parent_id, node_id)
+            for key, child in node.items():
+                if key != "type":  # Evita redundância no rótulo
+                    add_nodes_recursive(child, node_id)
+        elif isinstance(node, list):
+            dot.node(node_id, "List")
+            if parent_id:
+                dot.edge(parent_id, node_id)
+            for item in node:
+                add_nodes_recursive(item, node_id)
+        else:
+            dot.node(node_id, str(node))
+            if parent_id:
+                dot.edge(parent_id, node_id)
+
+    add_nodes_recursive(ast)
+    return dot
+
+
+def write_ast_dot(ast, filename):
+    """Grava o fonte .dot da AST em `filename` (só se mudou). Retorna True se gravou."""
+    return write_if_changed(filename, build_ast_graph(ast).source)
+
+
+def render_ast_dot(filename, format='png'):
+    """Renderiza o .dot `filename` em `filename.png`, a menos que a imagem já
+    exista e seja mais nova que o .dot. Retorna True se renderizou."""
+    output = f'{filename}.{format}'
+    if os.path.exists(output) and os.path.getmtime(output) >= os.path.getmtime(filename):
+        return False
+    import graphviz
+
+    graphviz.render('dot', format, filename)
+    return True
+
+
+class AstRenderer:
+    """Renderiza grafos da AST em segundo plano, em um pool de threads (o
+    trabalho é feito pelo processo `dot`, então as threads só esperam)."""
+
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ast-render')
+        self.pending = []
+
+    def submit(self, filename):
+        self.pending.append((filename, self.executor.submit(render_ast_dot, filename)))
+
+    def wait(self):
+        """Espera as renderizações pendentes e retorna (renderizados, reaproveitados, falhas),
+        onde falhas é uma lista de (arquivo, mensagem) na ordem de envio."""
+        import graphviz
+
+        rendered = skipped = 0
+        failures = []
+        for filename, future in self.pending:
+            try:
+                if future.result():
+                    rendered += 1
+                else:
+                    skipped += 1
+            except (graphviz.ExecutableNotFound, graphviz.CalledProcessError) as e:
+                failures.append((filename, str(e)))
+        self.pending = []
+        return rendered, skipped, failures
+
+    def close(self):
+        self.executor.shutdown()
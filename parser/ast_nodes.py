@@ -0,0 +1,217 @@
+"""Nós tipados da AST, com __slots__.
+
+Cada classe corresponde a um valor de "type" da AST em dicionários gerada
+pelo Parser. to_dict() devolve exatamente o dicionário que o Parser gera (as
+mesmas chaves, na mesma ordem), então os artefatos JSON continuam iguais, e
+from_dict() faz o caminho inverso."""
+
+import json
+import tracemalloc
+
+NODE_TYPES = {}
+
+def node_from_dict(data):
+    """Converte um nó (ou lista de nós) em dicionário para a classe tipada correspondente."""
+    if isinstance(data, list):
+        return [node_from_dict(item) for item in data]
+    if isinstance(data, dict) and data.get("type") in NODE_TYPES:
+        return NODE_TYPES[data["type"]].from_dict(data)
+    return data
+
+def typed_object_hook(data):
+    """object_hook para json.load que já cria os nós tipados durante a leitura."""
+    node_type = data.get("type")
+    if not isinstance(node_type, str) or node_type not in NODE_TYPES:
+        return data
+    return NODE_TYPES[node_type].from_dict(data)
+
+def node_to_dict(node):
+    if isinstance(node, list):
+        return [node_to_dict(item) for item in node]
+    if isinstance(node, Node):
+        return node.to_dict()
+    return node
+
+
+class Node:
+    __slots__ = ()
+    type = None
+    fields = ()
+
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        if cls.type is not None:
+            NODE_TYPES[cls.type] = cls
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self.fields, args), **kwargs)
+        for field in self.fields:
+            setattr(self, field, values[field])
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: node_from_dict(data[field]) for field in cls.fields})
+
+    def to_dict(self):
+        data = {"type": self.type}
+        for field in self.fields:
+            data[field] = node_to_dict(getattr(self, field))
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.fields)
+
+    def __repr__(self):
+        values = ', '.join(f'{field}={getattr(self, field)!r}' for field in self.fields)
+        return f'{type(self).__name__}({values})'
+
+
+class Program(Node):
+    __slots__ = ('body',)
+    type = "Program"
+    fields = ('body',)
+
+
+class CreateWindow(Node):
+    __slots__ = ('title', 'width', 'height')
+    type = "createWindow"
+    fields = ('title', 'width', 'height')
+
+    @classmethod
+    def from_dict(cls, data):
+        attributes = data["attributes"]
+        return cls(attributes["title"], attributes["width"], attributes["height"])
+
+    def to_dict(self):
+        return {
+            "type": self.type,
+            "attributes": {"title": self.title, "width": self.width, "height": self.height},
+        }
+
+
+class AddElement(Node):
+    # Os atributos variam (type, id, text, placeholder, x, y...) e sua ordem
+    # aparece no JSON, então ficam em um dicionário.
+    __slots__ = ('attributes',)
+    type = "addElement"
+    fields = ('attributes',)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(dict(data["attributes"]))
+
+    def to_dict(self):
+        return {"type": self.type, "attributes": dict(self.attributes)}
+
+
+class OnClick(Node):
+    __slots__ = ('target', 'actions')
+    type = "onClick"
+    fields = ('target', 'actions')
+
+
+class OnKeypress(Node):
+    __slots__ = ('key', 'actions')
+    type = "onKeypress"
+    fields = ('key', 'actions')
+
+
+class SetProperty(Node):
+    __slots__ = ('element_id', 'expression')
+    type = "setProperty"
+    fields = ('element_id', 'expression')
+
+
+class VariableAssignment(Node):
+    __slots__ = ('name', 'value')
+    type = "variable_assignment"
+    fields = ('name', 'value')
+
+
+class ShowElement(Node):
+    __slots__ = ('element_id',)
+    type = "showElement"
+    fields = ('element_id',)
+
+
+class HideElement(Node):
+    __slots__ = ('element_id',)
+    type = "hideElement"
+    fields = ('element_id',)
+
+
+class MoveElement(Node):
+    __slots__ = ('element_id', 'x', 'y')
+    type = "moveElement"
+    fields = ('element_id', 'x', 'y')
+
+
+class ShiftElement(Node):
+    __slots__ = ('element_id', 'x', 'y')
+    type = "shiftElement"
+    fields = ('element_id', 'x', 'y')
+
+
+class GetProperty(Node):
+    __slots__ = ('element_id', 'property')
+    type = "getProperty"
+    fields = ('element_id', 'property')
+
+
+class FunctionCall(Node):
+    __slots__ = ('name', 'arguments')
+    type = "function_call"
+    fields = ('name', 'arguments')
+
+
+class Identifier(Node):
+    __slots__ = ('name',)
+    type = "identifier"
+    fields = ('name',)
+
+
+class Number(Node):
+    __slots__ = ('value',)
+    type = "number"
+    fields = ('value',)
+
+
+class String(Node):
+    __slots__ = ('value',)
+    type = "string"
+    fields = ('value',)
+
+
+def memory_comparison(ast):
+    """Mede (com tracemalloc) a memória da AST em dicionários e da AST tipada.
+
+    As duas são lidas do mesmo JSON, então nenhuma compartilha objetos com
+    `ast` e ambas pagam pelas próprias strings. Retorna os tamanhos em bytes."""
+    serialized = json.dumps(ast)
+
+    tracemalloc.start()
+    as_dicts = json.loads(serialized)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del as_dicts
+
+    tracemalloc.start()
+    typed = json.loads(serialized, object_hook=typed_object_hook)
+    typed_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert node_to_dict(typed) == ast
+    return {
+        "dict_bytes": dict_bytes,
+        "typed_bytes": typed_bytes,
+        "ratio": round(typed_bytes / dict_bytes, 3) if dict_bytes else None,
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    from analisador_semantico.semantic import load_ast_from_file
+
+    for path in sys.argv[1:]:
+        print(path, json.dumps(memory_comparison(load_ast_from_file(path)), indent=4))
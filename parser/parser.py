@@ -1,12 +1,44 @@
 from lexer.my_token import TokenClass
-from graphviz import Digraph
-import uuid
+from parser.ast_graph import write_ast_dot, render_ast_dot
+import hashlib
+
+def split_statements(tokens):
+    """Divide a lista de tokens nas fronteiras das instruções de topo: um ';'
+    fora de blocos ou o '}' que fecha o bloco de um evento."""
+    start = 0
+    depth = 0
+    for index, token in enumerate(tokens):
+        if token.token_class != TokenClass.DELIMITADOR:
+            continue
+        if token.token_value == '{':
+            depth += 1
+        elif token.token_value == '}':
+            depth -= 1
+            if depth <= 0:
+                depth = 0
+                yield tokens[start:index + 1]
+                start = index + 1
+        elif token.token_value == ';' and depth == 0:
+            yield tokens[start:index + 1]
+            start = index + 1
+    if start < len(tokens):
+        yield tokens[start:]
+
+def statement_key(tokens):
+    """Hash dos tokens (classe e valor) de uma instrução, independente da posição no arquivo."""
+    digest = hashlib.blake2b(digest_size=16)
+    for token in tokens:
+        digest.update(f"{token.token_class.name}\x1e{token.token_value}\x1f".encode())
+    return digest.digest()
 
 class Parser:
     def __init__(self, tokens):
+        # Aceita uma lista ou qualquer iterável de tokens (ex.: lexer_stream);
+        # o parser só olha o token atual, então os tokens são consumidos sob demanda.
         self.tokens = tokens
+        self._token_iterator = iter(tokens)
         self.current_token_index = 0
-        self.current_token = self.tokens[0]
+        self.current_token = next(self._token_iterator, None)
 
         # Mapeamento de palavras reservadas para métodos de parsing correspondentes
         self.parse_map = {
@@ -25,10 +57,7 @@ class Parser:
 
     def advance(self):
         self.current_token_index += 1
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]
-        else:
-            self.current_token = None
+        self.current_token = next(self._token_iterator, None)
 
     def expect(self, token_class, token_value=None):
         if (self.current_token is not None and 
@@ -45,11 +74,59 @@ class Parser:
         """Faz o parse de uma lista de tokens e constrói a AST."""
         instructions = []
         while self.current_token is not None:
-            instruction = self.parse_instruction()
+            try:
+                instruction = self.parse_instruction()
+            except AttributeError:
+                # Os parse_* leem current_token direto; no fim da entrada ele é None
+                if self.current_token is not None:
+                    raise
+                raise SyntaxError("Fim inesperado do código: a última instrução está incompleta") from None
             if instruction is not None:
                 instructions.append(instruction)
         return {"type": "Program", "body": instructions}
 
+    def parse_incremental(self, cache):
+        """Faz o parse reaproveitando as instruções de topo de compilações anteriores.
+
+        Cada instrução de topo (veja split_statements) é procurada em `cache`
+        pelo hash dos seus tokens, e só as novas ou alteradas passam pelos
+        métodos parse_*. `cache` é um dicionário mantido pelo chamador entre
+        compilações; ao final ele guarda apenas as instruções do programa
+        atual. As subárvores reaproveitadas são compartilhadas entre ASTs e
+        não devem ser alteradas.
+
+        Retorna (ast, {"reused": n, "reparsed": m})."""
+        tokens = []
+        if self.current_token is not None:
+            tokens.append(self.current_token)
+            tokens.extend(self._token_iterator)
+            self.current_token = None
+
+        entries = {}
+        body = []
+        stats = {"reused": 0, "reparsed": 0}
+        try:
+            for chunk in split_statements(tokens):
+                key = statement_key(chunk)
+                statements = entries.get(key, cache.get(key))
+                if statements is None:
+                    statements = Parser(chunk).parse()["body"]
+                    stats["reparsed"] += 1
+                else:
+                    stats["reused"] += 1
+                entries[key] = statements
+                body.extend(statements)
+        except (SyntaxError, AttributeError):
+            # Um trecho malformado pode ter sido cortado no lugar errado:
+            # o parse completo dá o erro (ou a AST) exatamente como antes.
+            cache.clear()
+            ast = Parser(tokens).parse()
+            return ast, {"reused": 0, "reparsed": len(ast["body"])}
+
+        cache.clear()
+        cache.update(entries)
+        return {"type": "Program", "body": body}, stats
+
     def parse_instruction(self):
         """Direciona para o parser adequado com base no token atual."""
         token_value = self.current_token.token_value
@@ -298,31 +375,8 @@ class Parser:
         print(json.dumps(ast, indent=4))
 
     def generate_ast_graph(self, ast, filename="ast"):
-        """Gera um gráfico visual da AST e salva como uma imagem."""
-        dot = Digraph(comment='AST')
-        
-        def add_nodes_recursive(node, parent_id=None):
-            node_id = str(uuid.uuid4())
-            if isinstance(node, dict):
-                label = node.get("type", "node")
-                dot.node(node_id, label)
-                if parent_id:
-                    dot.edge(parent_id, node_id)
-                for key, child in node.items():
-                    if key != "type":  # Evita redundância no rótulo
-                        add_nodes_recursive(child, node_id)
-            elif isinstance(node, list):
-                list_id = str(uuid.uuid4())
-                dot.node(list_id, "List")
-                if parent_id:
-                    dot.edge(parent_id, list_id)
-                for item in node:
-                    add_nodes_recursive(item, list_id)
-            else:
-                dot.node(node_id, str(node))
-                if parent_id:
-                    dot.edge(parent_id, node_id)
-
-        add_nodes_recursive(ast)
-        dot.render(filename, format='png')
+        """Gera um gráfico visual da AST e salva como uma imagem (se o .dot
+        não mudou desde a última imagem, ela é reaproveitada)."""
+        write_ast_dot(ast, filename)
+        render_ast_dot(filename)
         print(f"AST visual salva como {filename}.png")
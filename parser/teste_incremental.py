@@ -0,0 +1,71 @@
+"""Teste diferencial de Parser.parse_incremental(): aplica edições de linha
+aleatórias a um programa sintético (inserir, remover, truncar, trocar) e
+compara, a cada passo, o resultado com o de Parser.parse() — a mesma AST ou
+o mesmo erro —, usando o mesmo cache ao longo de toda a sequência.
+
+    python -m parser.teste_incremental [--edits N] [--seed S]
+"""
+
+import random
+from benchmarks.workload import WorkloadParams, generate_program
+from lexer.lexer import lexer
+from parser.parser import Parser
+
+def _outcome(parse):
+    # Entradas malformadas também podem dar ValueError (int() de um token que
+    # não é número); os dois caminhos precisam falhar da mesma forma
+    try:
+        return "ok", parse()
+    except (SyntaxError, ValueError) as e:
+        return type(e).__name__, str(e)
+
+def check(edits=1500, seed=0):
+    """Retorna (edições comparadas, divergências), onde cada divergência é
+    (código, resultado_incremental, resultado_completo)."""
+    rng = random.Random(seed)
+    lines = generate_program(WorkloadParams(elements=12, click_handlers=3, keypress_handlers=2, variables=4)).splitlines()
+    current = lines[:]
+    cache = {}
+    checked = 0
+    mismatches = []
+    for _ in range(edits):
+        edited = current[:]
+        operation = rng.randrange(4)
+        index = rng.randrange(len(edited))
+        if operation == 0:
+            edited.insert(index, rng.choice(lines))
+        elif operation == 1 and len(edited) > 2:
+            edited.pop(index)
+        elif operation == 2:
+            # Truncar uma linha costuma deixar o programa malformado
+            edited[index] = edited[index][:rng.randrange(len(edited[index]) + 1)]
+        else:
+            edited[index] = rng.choice(lines)
+        code = '\n'.join(edited)
+        try:
+            tokens = lexer(code)
+        except SyntaxError:
+            continue
+        expected = _outcome(lambda: Parser(tokens).parse())
+        got = _outcome(lambda: Parser(tokens).parse_incremental(cache)[0])
+        checked += 1
+        if got != expected:
+            mismatches.append((code, got, expected))
+        if expected[0] == "ok" and rng.random() < 0.7:
+            current = edited
+    return checked, mismatches
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compara parse_incremental() com parse()")
+    arg_parser.add_argument('--edits', type=int, default=1500)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    checked, mismatches = check(args.edits, args.seed)
+    for code, got, expected in mismatches[:3]:
+        print(f"Divergência:\n{code}\n  incremental: {str(got)[:200]}\n  completo:    {str(expected)[:200]}")
+    print(f"{checked} edições comparadas, {len(mismatches)} divergências")
+    raise SystemExit(1 if mismatches else 0)
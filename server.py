@@ -0,0 +1,269 @@
+"""Servidor local de compilação SimpleUI, com JSON-RPC 2.0.
+
+Cada mensagem é um objeto JSON em uma linha, tanto na entrada padrão
+(--stdio) quanto em um socket Unix (--socket CAMINHO). O processo fica
+residente, então os autômatos são construídos uma única vez e cada pedido
+paga só o custo das fases.
+
+Métodos (params entre chaves):
+    lex      {source, lexer?}          -> {tokens: [[classe, valor, linha, coluna], ...]}
+    parse    {source, lexer?}          -> {ast}
+    analyze  {source, lexer?}          -> {ast, symbol_table, errors}
+    compile  {source, lexer?}          -> {ast, symbol_table, errors, c_code}
+    render   {source, lexer?}          -> {dot}   (só aqui o graphviz é importado)
+    stats    {}                        -> latências por método e tempo de inicialização
+    shutdown {}                        -> encerra o servidor
+
+    python server.py --stdio
+    python server.py --socket /tmp/simpleui.sock
+    python server.py --measure         # mede partida a frio e latência por pedido
+"""
+
+import inspect
+import json
+import os
+import sys
+import time
+
+# Marcado antes dos imports do compilador, para medir o custo deles
+_process_start = time.perf_counter()
+
+from lexer.backends import DEFAULT_BACKEND, LEXER_BACKENDS, get_lexer
+from lexer.registry import get_registry
+from parser.parser import Parser
+from analisador_semantico.semantic import SemanticAnalyzer
+from tradutor.ctranslator import GtkTranslator
+
+# Códigos de erro do JSON-RPC 2.0; APPLICATION_ERROR é usado para erros de
+# compilação (léxicos, sintáticos ou semânticos).
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+APPLICATION_ERROR = 1
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class CompileService:
+    """Implementa os métodos do servidor e mede a latência de cada um."""
+
+    def __init__(self):
+        start = time.perf_counter()
+        get_registry()
+        self.started_at = time.perf_counter()
+        self.startup = {
+            "import_ms": round((start - _process_start) * 1000, 3),
+            "registry_ms": round((self.started_at - start) * 1000, 3),
+        }
+        self.latencies = {}
+        self.running = True
+        self.methods = {
+            "lex": self.lex,
+            "parse": self.parse,
+            "analyze": self.analyze,
+            "compile": self.compile,
+            "render": self.render,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+        self.signatures = {name: inspect.signature(method) for name, method in self.methods.items()}
+
+    def handle_line(self, line):
+        """Processa uma linha (um pedido JSON-RPC) e devolve a resposta
+        serializada, ou None para notificações (pedidos sem id)."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return self._error(None, PARSE_ERROR, f"JSON inválido: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self._error(request.get("id") if isinstance(request, dict) else None,
+                               INVALID_REQUEST, "Pedido inválido")
+
+        request_id = request.get("id")
+        method = request["method"]
+        start = time.perf_counter()
+        try:
+            if method not in self.methods:
+                raise RpcError(METHOD_NOT_FOUND, f"Método desconhecido: {method}")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params deve ser um objeto")
+            try:
+                self.signatures[method].bind(**params)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e))
+            response = {"jsonrpc": "2.0", "id": request_id, "result": self.methods[method](**params)}
+        except RpcError as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+        except (SyntaxError, ValueError) as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": APPLICATION_ERROR, "message": str(e)}}
+        except Exception as e:
+            # Uma falha em um pedido não pode derrubar o servidor residente
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}}
+        self._record(method, time.perf_counter() - start)
+        if "id" not in request:
+            return None
+        return json.dumps(response)
+
+    def _error(self, request_id, code, message):
+        return json.dumps({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+    def _record(self, method, elapsed):
+        if method not in self.methods:
+            return
+        record = self.latencies.setdefault(method, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        record["count"] += 1
+        record["total_ms"] += elapsed * 1000
+        record["max_ms"] = max(record["max_ms"], elapsed * 1000)
+
+    def _tokens(self, source, lexer):
+        if not isinstance(source, str):
+            raise RpcError(INVALID_PARAMS, "source deve ser uma string")
+        if not isinstance(lexer, str) or lexer not in LEXER_BACKENDS:
+            raise RpcError(INVALID_PARAMS, f"lexer desconhecido: {lexer!r} (opções: {', '.join(LEXER_BACKENDS)})")
+        return get_lexer(lexer)(source)
+
+    def _analyze(self, source, lexer):
+        ast = Parser(self._tokens(source, lexer)).parse()
+        analyzer = SemanticAnalyzer()
+        symbol_table = analyzer.analyze(ast)
+        return ast, symbol_table, analyzer.errors
+
+    def lex(self, source, lexer=DEFAULT_BACKEND):
+        return {"tokens": [[t.token_class.name, t.token_value, t.line, t.column] for t in self._tokens(source, lexer)]}
+
+    def parse(self, source, lexer=DEFAULT_BACKEND):
+        return {"ast": Parser(self._tokens(source, lexer)).parse()}
+
+    def analyze(self, source, lexer=DEFAULT_BACKEND):
+        ast, symbol_table, errors = self._analyze(source, lexer)
+        return {"ast": ast, "symbol_table": symbol_table, "errors": errors}
+
+    def compile(self, source, lexer=DEFAULT_BACKEND):
+        ast, symbol_table, errors = self._analyze(source, lexer)
+        c_code = GtkTranslator(symbol_table).translate()
+        return {"ast": ast, "symbol_table": symbol_table, "errors": errors, "c_code": c_code}
+
+    def render(self, source, lexer=DEFAULT_BACKEND):
+        from parser.ast_graph import build_ast_graph
+
+        return {"dot": build_ast_graph(Parser(self._tokens(source, lexer)).parse()).source}
+
+    def stats(self):
+        return {
+            "startup": self.startup,
+            "uptime_ms": round((time.perf_counter() - self.started_at) * 1000, 3),
+            "graphviz_loaded": "graphviz" in sys.modules,
+            "methods": {
+                method: {
+                    "count": record["count"],
+                    "mean_ms": round(record["total_ms"] / record["count"], 3),
+                    "max_ms": round(record["max_ms"], 3),
+                }
+                for method, record in self.latencies.items()
+            },
+        }
+
+    def shutdown(self):
+        self.running = False
+        return None
+
+
+def serve_stdio(service, stdin=sys.stdin, stdout=sys.stdout):
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = service.handle_line(line)
+        if response is not None:
+            stdout.write(response + '\n')
+            stdout.flush()
+        if not service.running:
+            break
+
+def serve_socket(service, path):
+    """Atende clientes em um socket Unix, um de cada vez (as fases são
+    limitadas pela CPU, então atender em paralelo não ganharia nada com o GIL)."""
+    import socket
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        listener.listen()
+        try:
+            while service.running:
+                connection, _ = listener.accept()
+                with connection, connection.makefile('r', encoding='utf-8') as reader, \
+                        connection.makefile('w', encoding='utf-8') as writer:
+                    serve_stdio(service, reader, writer)
+        finally:
+            os.remove(path)
+
+
+def measure(requests=50, source_path=None):
+    """Inicia um servidor --stdio em outro processo e mede a partida a frio
+    (até a primeira resposta) e a latência de cada pedido seguinte, vista pelo cliente."""
+    import subprocess
+    from utils.helpers import read_file
+
+    source_path = source_path or os.path.join('testes', 'codigo_formulario.simpleui')
+    source = read_file(source_path)
+
+    def call(process, request_id, method, params):
+        process.stdin.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}) + '\n')
+        process.stdin.flush()
+        return json.loads(process.stdout.readline())
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--stdio'],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        call(process, 0, "compile", {"source": source})
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        latencies = {}
+        for method in ("lex", "analyze", "compile"):
+            timings = []
+            for request_id in range(requests):
+                request_start = time.perf_counter()
+                response = call(process, request_id + 1, method, {"source": source})
+                timings.append((time.perf_counter() - request_start) * 1000)
+                if "error" in response:
+                    raise RuntimeError(response["error"]["message"])
+            timings.sort()
+            latencies[method] = {
+                "median_ms": round(timings[len(timings) // 2], 3),
+                "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+            }
+        server_stats = call(process, requests + 1, "stats", {})["result"]
+        call(process, requests + 2, "shutdown", {})
+    finally:
+        process.stdin.close()
+        process.wait()
+    return {"source": source_path, "cold_start_ms": round(cold_ms, 3), "requests": latencies, "server": server_stats}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Servidor de compilação SimpleUI (JSON-RPC)")
+    transport = arg_parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument('--stdio', action='store_true', help="lê pedidos da entrada padrão")
+    transport.add_argument('--socket', metavar='CAMINHO', help="atende em um socket Unix")
+    transport.add_argument('--measure', action='store_true', help="mede partida a frio e latência por pedido")
+    arg_parser.add_argument('--requests', type=int, default=50, help="pedidos por método em --measure")
+    arg_parser.add_argument('--source', help="arquivo .simpleui usado em --measure")
+    args = arg_parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.requests, args.source), indent=4))
+    elif args.stdio:
+        serve_stdio(CompileService())
+    else:
+        serve_socket(CompileService(), args.socket)
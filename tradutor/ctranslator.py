@@ -1,30 +1,105 @@
+import io
+
+# Onde activate coloca o rótulo criado para cada variável movida por shiftElement
+SHIFTED_LABEL_POSITION = (50, 50)
+
+class TranslationIndex:
+    """Tudo o que a tradução precisa saber dos eventos, obtido em uma única
+    passada pela tabela semântica:
+
+    - click_handlers: alvo do onClick -> informações do evento;
+    - keypress_handlers: tecla -> informações do evento;
+    - shifted_widgets: variáveis movidas por shiftElement, na ordem em que
+      aparecem, sem repetição;
+    - referenced_variables: variáveis usadas nas ações dos handlers;
+    - updated_labels: elementos cujo texto é alterado por setProperty."""
+
+    def __init__(self, semantic_table):
+        self.click_handlers = {}
+        self.keypress_handlers = {}
+        # Dicionários com valor None fazem papel de conjuntos ordenados
+        self.shifted_widgets = {}
+        self.referenced_variables = {}
+        self.updated_labels = {}
+
+        variables = semantic_table.get('variables', {})
+        for target, event_info in semantic_table.get('events', {}).items():
+            if target == 'keypress':
+                self.keypress_handlers = event_info
+                for key_event in event_info.values():
+                    for action in key_event.get('actions', []):
+                        if action['type'] == 'shiftElement':
+                            element_id = action['element_id'].strip('"')
+                            self.shifted_widgets[element_id] = None
+                            if element_id in variables:
+                                self.referenced_variables[element_id] = None
+            elif event_info.get('type') == 'onClick':
+                self.click_handlers[target] = event_info
+                for action in event_info.get('actions', []):
+                    if action['type'] == 'setProperty':
+                        self.updated_labels[action['element_id'].strip('"')] = None
+                    for part in action.get('expression', ()):
+                        if part in variables:
+                            self.referenced_variables[part] = None
+
+
+class ClickHandlerState:
+    """O que já foi declarado e calculado dentro do callback em geração:
+    nomes locais, comprimentos já medidos (variável -> local com o
+    comprimento) e campos já lidos por getProperty (id -> local com o texto)."""
+
+    def __init__(self):
+        self.declared = set()
+        self.lengths = {}
+        self.reads = {}
+
+
 class GtkTranslator:
+    """Gera o código C + GTK a partir da tabela semântica, escrevendo direto
+    em um fluxo de saída (veja write); translate devolve o código como string."""
+
     def __init__(self, semantic_table):
         self.semantic_table = semantic_table
-        self.code = []
+        self.index = TranslationIndex(semantic_table)
+        self._write = None
         self.indent = 0
+        self._separator = ''
+        self.line_count = 0
 
     def _add_line(self, line):
-        """Adiciona linha de código com indentação"""
-        self.code.append('    ' * self.indent + line)
+        """Escreve linha de código com indentação"""
+        self._write(f"{self._separator}{'    ' * self.indent}{line}")
+        self._separator = '\n'
+        self.line_count += 1
 
     def translate(self):
         """Traduz tabela semântica para código GTK"""
+        output = io.StringIO()
+        self.write(output)
+        return output.getvalue()
+
+    def write(self, output):
+        """Escreve o código GTK em `output` (qualquer objeto com write, de
+        preferência com buffer), sem montar o programa inteiro em memória."""
+        self._write = output.write
+        self.indent = 0
+        self._separator = ''
+        self.line_count = 0
         self._add_line('#include <gtk/gtk.h>')
         self._add_line('#include <stdio.h>')
         self._add_line('#include <string.h>')
         self._add_line('')
         
         self._add_global_declarations()
+        self._add_callbacks()
         
-        events = self.semantic_table.get('events', {})
-        if 'keypress' in events:
+        if self.index.keypress_handlers:
             self._add_line('static gboolean on_key_press(GtkWidget *widget, GdkEventKey *event, gpointer data) {')
             self.indent += 1
             self._add_line('switch(event->keyval) {')
             self.indent += 1
             
-            for key, event_info in events['keypress'].items():
+            for key, event_info in self.index.keypress_handlers.items():
                 self._add_line(f'case GDK_KEY_{key}:')
                 self.indent += 1
                 for action in event_info.get('actions', []):
@@ -32,14 +107,9 @@ class GtkTranslator:
                         element_id = action['element_id'].strip('"')
                         x_shift = action.get('x', 0)
                         y_shift = action.get('y', 0)
-                        self._add_line('{')
-                        self.indent += 1
-                        self._add_line(f'GtkFixed *fixed = GTK_FIXED(gtk_widget_get_parent(widget_{element_id}));')
-                        self._add_line('GtkAllocation allocation;')
-                        self._add_line(f'gtk_widget_get_allocation(widget_{element_id}, &allocation);')
-                        self._add_line(f'gtk_fixed_move(fixed, widget_{element_id}, allocation.x + {x_shift}, allocation.y + {y_shift});')
-                        self.indent -= 1
-                        self._add_line('}')
+                        self._add_line(f'position_{element_id}.x += {x_shift};')
+                        self._add_line(f'position_{element_id}.y += {y_shift};')
+                        self._add_line(f'gtk_fixed_move(fixed_container, widget_{element_id}, position_{element_id}.x, position_{element_id}.y);')
                 self._add_line('break;')
                 self.indent -= 1
             
@@ -53,8 +123,6 @@ class GtkTranslator:
         self._add_activate_function()
         
         self._add_main()
-        
-        return '\n'.join(self.code)
 
     def _add_global_declarations(self):
         """Adiciona declarações globais"""
@@ -62,17 +130,31 @@ class GtkTranslator:
         elements = self.semantic_table.get('elements', {})
         for element_id in elements:
             self._add_line(f'GtkWidget *widget_{element_id};')
-        
-        shifted_vars = set()
-        events = self.semantic_table.get('events', {})
-        for event_type, event_info in events.items():
-            if event_type == 'keypress':
-                for key_event in event_info.values():
-                    for action in key_event.get('actions', []):
-                        if action['type'] == 'shiftElement':
-                            element_id = action['element_id'].strip('"')
-                            shifted_vars.add(element_id)
-                            self._add_line(f'GtkWidget *widget_{element_id};')
+        for element_id in self.index.shifted_widgets:
+            if element_id not in elements:
+                self._add_line(f'GtkWidget *widget_{element_id};')
+
+        if self.index.shifted_widgets:
+            # Posições mantidas pelo próprio programa: os handlers de tecla
+            # movem os widgets sem consultar o GTK
+            self._add_line('')
+            self._add_line('// Posições dos widgets movidos por shiftElement')
+            self._add_line('typedef struct {')
+            self.indent += 1
+            self._add_line('gint x;')
+            self._add_line('gint y;')
+            self.indent -= 1
+            self._add_line('} WidgetPosition;')
+            for element_id in self.index.shifted_widgets:
+                x, y = self._initial_position(element_id)
+                self._add_line(f'WidgetPosition position_{element_id} = {{{x}, {y}}};')
+            self._add_line('GtkFixed *fixed_container;')
+
+        if self.index.updated_labels:
+            self._add_line('')
+            self._add_line('// Textos dos rótulos alterados por setProperty (reaproveitados a cada clique)')
+            for element_id in self.index.updated_labels:
+                self._add_line(f'GString *text_{element_id};')
         
         variables = self.semantic_table.get('variables', {})
         if variables:
@@ -89,42 +171,85 @@ class GtkTranslator:
         self._add_line('')
 
     def _add_callbacks(self):
-        """Adiciona callbacks para eventos"""
-        events = self.semantic_table.get('events', {})
-        
-        for target, event_info in events.items():
-            if target != 'keypress' and event_info.get('type') == 'onClick':
-                self._add_line(f'static void on_click_{target}(GtkWidget *widget, gpointer data) {{')
-                self.indent += 1
-                
-                for action in event_info.get('actions', []):
-                    if action['type'] == 'variable_assignment':
-                        if action['value']['type'] == 'function_call' and action['value']['name'] == 'getProperty':
-                            element_id = action['value']['arguments'][0].strip('"')
-                            self._add_line(f'const char* {action["name"]} = gtk_entry_get_text(GTK_ENTRY(widget_{element_id}));')
-                    elif action['type'] == 'setProperty':
-                        element_id = action['element_id'].strip('"')
-                        if 'expression' in action:
-                            self._add_line('char buffer[1024];')
-                            expr_parts = []
-                            values = []
-                            for part in action['expression']:
-                                if part == '+':
-                                    continue
-                                if isinstance(part, str):
-                                    if part.startswith('"'):
-                                        expr_parts.append('%s')
-                                        values.append(part)
-                                    else:
-                                        expr_parts.append('%s')
-                                        values.append(part)
-                            format_str = ', '.join(values)
-                            self._add_line(f'sprintf(buffer, "{", ".join(expr_parts)}", {format_str});')
-                            self._add_line(f'gtk_label_set_text(GTK_LABEL(widget_{element_id}), buffer);')
-                
-                self.indent -= 1
-                self._add_line('}')
-                self._add_line('')
+        """Adiciona callbacks para eventos onClick"""
+        for target, event_info in self.index.click_handlers.items():
+            self._add_line(f'static void on_click_{target}(GtkWidget *widget, gpointer data) {{')
+            self.indent += 1
+            handler = ClickHandlerState()
+            for action in event_info.get('actions', []):
+                if action['type'] == 'variable_assignment':
+                    if action['value']['type'] == 'function_call' and action['value']['name'] == 'getProperty':
+                        self._add_get_property(action['name'], action['value'], handler)
+                elif action['type'] == 'setProperty' and 'expression' in action:
+                    self._add_set_property(action, handler)
+            self.indent -= 1
+            self._add_line('}')
+            self._add_line('')
+
+    def _add_get_property(self, name, function_call, handler):
+        """Lê o texto de um campo; se o mesmo campo já foi lido neste handler,
+        reaproveita a leitura em vez de consultar o GTK de novo."""
+        element_id = function_call['arguments'][0].strip('"')
+        value = handler.reads.get(element_id, f'gtk_entry_get_text(GTK_ENTRY(widget_{element_id}))')
+        if value == name:
+            # `name` já guarda esta leitura; o comprimento dela continua valendo
+            return
+        if name in handler.declared:
+            self._add_line(f'{name} = {value};')
+        else:
+            self._add_line(f'const char* {name} = {value};')
+            handler.declared.add(name)
+        # `name` mudou: leituras e comprimentos guardados nela não valem mais
+        handler.lengths.pop(name, None)
+        for read_id, holder in list(handler.reads.items()):
+            if holder == name:
+                del handler.reads[read_id]
+        handler.reads[element_id] = name
+
+    def _text_operand(self, name, handler):
+        """(texto, comprimento) em C de uma variável usada em setProperty. O
+        comprimento (e, para números, o texto) é calculado uma vez por handler."""
+        variables = self.semantic_table.get('variables', {})
+        is_number = (name not in handler.declared and name in self.index.referenced_variables
+                     and variables[name]['type'] == 'number')
+        text = f'{name}_text' if is_number else name
+        if name not in handler.lengths:
+            length = f'{name}_length'
+            declaration = '' if length in handler.declared else 'gsize '
+            if is_number:
+                if text not in handler.declared:
+                    # Cabe qualquer int de 32 bits com sinal e o terminador
+                    self._add_line(f'char {text}[12];')
+                    handler.declared.add(text)
+                self._add_line(f'{declaration}{length} = (gsize) snprintf({text}, sizeof {text}, "%d", {name});')
+            else:
+                self._add_line(f'{declaration}{length} = strlen({name});')
+            handler.declared.add(length)
+            handler.lengths[name] = length
+        return text, handler.lengths[name]
+
+    def _add_set_property(self, action, handler):
+        """Monta o texto no GString do rótulo, reservando antes o comprimento
+        exato (a memória só cresce quando o texto passa do maior já usado), e
+        só chama gtk_label_set_text se o texto mudou."""
+        element_id = action['element_id'].strip('"')
+        operands = []
+        for part in action['expression']:
+            if part.startswith('"'):
+                operands.append((part, f'(sizeof {part} - 1)'))
+            elif part[:1].isalpha() or part[:1] == '_':
+                operands.append(self._text_operand(part, handler))
+        buffer = f'text_{element_id}'
+        total = ' + '.join(length for _, length in operands) or '0'
+        self._add_line(f'g_string_set_size({buffer}, {total});')
+        self._add_line(f'g_string_truncate({buffer}, 0);')
+        for text, length in operands:
+            self._add_line(f'g_string_append_len({buffer}, {text}, {length});')
+        self._add_line(f'if (strcmp(gtk_label_get_text(GTK_LABEL(widget_{element_id})), {buffer}->str) != 0) {{')
+        self.indent += 1
+        self._add_line(f'gtk_label_set_text(GTK_LABEL(widget_{element_id}), {buffer}->str);')
+        self.indent -= 1
+        self._add_line('}')
 
     def _add_activate_function(self):
         """Adiciona função de ativação principal"""
@@ -139,28 +264,24 @@ class GtkTranslator:
 
         self._add_line('GtkWidget *fixed = gtk_fixed_new();')
         self._add_line('gtk_container_add(GTK_CONTAINER(window), fixed);')
+        if self.index.shifted_widgets:
+            self._add_line('fixed_container = GTK_FIXED(fixed);')
         
         elements = self.semantic_table.get('elements', {})
         for element_id, element_info in elements.items():
             self._create_element(element_id, element_info, 'fixed')
+        for element_id in self.index.updated_labels:
+            self._add_line(f'text_{element_id} = g_string_new(NULL);')
         
-        shifted_vars = set()
-        events = self.semantic_table.get('events', {})
-        for event_type, event_info in events.items():
-            if event_type == 'keypress':
-                for key_event in event_info.values():
-                    for action in key_event.get('actions', []):
-                        if action['type'] == 'shiftElement':
-                            element_id = action['element_id'].strip('"')
-                            shifted_vars.add(element_id)
-                            variables = self.semantic_table.get('variables', {})
-                            if element_id in variables:
-                                var_info = variables[element_id]
-                                var_value = var_info['value'].strip('"')
-                                self._add_line(f'widget_{element_id} = gtk_label_new("{var_value}");')
-                                self._add_line(f'gtk_fixed_put(GTK_FIXED(fixed), widget_{element_id}, 50, 50);')
+        variables = self.semantic_table.get('variables', {})
+        for element_id in self.index.shifted_widgets:
+            if element_id in variables:
+                var_value = variables[element_id]['value'].strip('"')
+                self._add_line(f'widget_{element_id} = gtk_label_new("{var_value}");')
+                x, y = SHIFTED_LABEL_POSITION
+                self._add_line(f'gtk_fixed_put(GTK_FIXED(fixed), widget_{element_id}, {x}, {y});')
         
-        if 'keypress' in events:
+        if self.index.keypress_handlers:
             self._add_line('g_signal_connect(window, "key-press-event", G_CALLBACK(on_key_press), NULL);')
         
         self._add_line('gtk_widget_show_all(window);')
@@ -168,6 +289,13 @@ class GtkTranslator:
         self._add_line('}')
         self._add_line('')
 
+    def _initial_position(self, element_id):
+        """Posição em que activate coloca o widget movido `element_id`."""
+        if element_id in self.semantic_table.get('variables', {}):
+            return SHIFTED_LABEL_POSITION
+        attrs = self.semantic_table.get('elements', {}).get(element_id, {}).get('attributes', {})
+        return attrs.get('x', 0), attrs.get('y', 0)
+
     def _create_element(self, element_id, element_info, container_name):
         """Cria elemento GTK baseado nas informações do elemento"""
         attrs = element_info['attributes']
@@ -189,8 +317,7 @@ class GtkTranslator:
         
         self._add_line(f'gtk_fixed_put(GTK_FIXED({container_name}), widget_{element_id}, {x}, {y});')
         
-        events = self.semantic_table.get('events', {})
-        if element_id in events and events[element_id]['type'] == 'onClick':
+        if element_id in self.index.click_handlers:
             self._add_line(f'g_signal_connect(widget_{element_id}, "clicked", G_CALLBACK(on_click_{element_id}), NULL);')
 
     def _add_main(self):
@@ -0,0 +1,56 @@
+import json
+import marshal
+import time
+
+# "json" é o formato legível de sempre (indentado); "json-min" é o mesmo JSON
+# sem espaços; "marshal" é binário, com um cabeçalho próprio.
+ARTIFACT_FORMATS = ("json", "json-min", "marshal")
+DEFAULT_FORMAT = "json"
+
+MARSHAL_MAGIC = b'SUIM'
+
+def artifact_filename(base, artifact_format=DEFAULT_FORMAT):
+    return f'{base}.bin' if artifact_format == "marshal" else f'{base}.json'
+
+def dumps_artifact(data, artifact_format=DEFAULT_FORMAT):
+    """Serializa `data` (AST ou tabela de símbolos) no formato pedido, em bytes."""
+    if artifact_format == "json":
+        return json.dumps(data, indent=4).encode()
+    if artifact_format == "json-min":
+        return json.dumps(data, separators=(',', ':')).encode()
+    if artifact_format == "marshal":
+        return MARSHAL_MAGIC + bytes([marshal.version]) + marshal.dumps(data)
+    raise ValueError(f"Formato de artefato desconhecido: {artifact_format!r} (opções: {', '.join(ARTIFACT_FORMATS)})")
+
+def loads_artifact(data):
+    """Inverso de dumps_artifact; o formato é reconhecido pelo conteúdo."""
+    if data.startswith(MARSHAL_MAGIC):
+        if data[len(MARSHAL_MAGIC)] != marshal.version:
+            raise ValueError(f"Artefato gerado com a versão {data[len(MARSHAL_MAGIC)]} do marshal (esperada: {marshal.version})")
+        return marshal.loads(data[len(MARSHAL_MAGIC) + 1:])
+    return json.loads(data)
+
+def load_artifact(file_path):
+    with open(file_path, 'rb') as file:
+        return loads_artifact(file.read())
+
+
+def compare_formats(data, repeat=20):
+    """Tamanho (bytes) e melhor tempo de carga (ms) de `data` em cada formato."""
+    report = {}
+    for artifact_format in ARTIFACT_FORMATS:
+        serialized = dumps_artifact(data, artifact_format)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            loads_artifact(serialized)
+            timings.append(time.perf_counter() - start)
+        report[artifact_format] = {"bytes": len(serialized), "load_ms": round(min(timings) * 1000, 3)}
+    return report
+
+
+if __name__ == '__main__':
+    import sys
+
+    for path in sys.argv[1:]:
+        print(path, json.dumps(compare_formats(load_artifact(path)), indent=4))
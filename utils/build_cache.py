@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import shutil
+from utils.helpers import write_if_changed
+
+COMPILER_VERSION = 1
+
+# Pacotes (e módulos) cujo código determina os artefatos gerados
+COMPILER_SOURCES = ('lexer', 'parser', 'analisador_semantico', 'tradutor', 'utils', 'main.py')
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('SIMPLEUI_CACHE_DIR', '.simpleui_cache'), 'build')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+MANIFEST = 'manifest.json'
+
+_compiler_hash = None
+
+def compiler_hash():
+    """Hash da versão do compilador e do código-fonte dos seus módulos (calculado uma vez por processo)."""
+    global _compiler_hash
+    if _compiler_hash is None:
+        digest = hashlib.sha256(f'v{COMPILER_VERSION}'.encode())
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for source in COMPILER_SOURCES:
+            path = os.path.join(root, source)
+            if os.path.isdir(path):
+                names = sorted(os.path.join(source, name) for name in os.listdir(path) if name.endswith('.py'))
+            else:
+                names = [source]
+            for name in names:
+                with open(os.path.join(root, name), 'rb') as file:
+                    digest.update(name.encode())
+                    digest.update(file.read())
+        _compiler_hash = digest.hexdigest()
+    return _compiler_hash
+
+
+class BuildCache:
+    """Cache em disco dos artefatos de compilação, endereçado pelo conteúdo.
+
+    Cada entrada é um diretório com nome igual à chave (hash do código-fonte,
+    do compilador e das opções que alteram a saída), contendo os artefatos, a
+    saída de console e um manifest.json com o status e os nomes dos arquivos.
+    O mtime do diretório marca o último uso; evict() remove as entradas menos
+    usadas recentemente até o total caber em max_bytes."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, code, *options):
+        digest = hashlib.sha256(compiler_hash().encode())
+        digest.update(json.dumps(options).encode())
+        digest.update(code.encode())
+        return digest.hexdigest()[:32]
+
+    def restore(self, key):
+        """Copia os artefatos da entrada `key` para o diretório atual (só os
+        que mudaram) e retorna (saída_de_console, status), ou None se não há
+        entrada. Todos os artefatos são lidos antes de qualquer escrita: uma
+        entrada removida no meio da leitura (evict() de outro processo) conta
+        como ausente, sem deixar parte dos arquivos restaurada."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, MANIFEST), encoding='utf-8') as file:
+                manifest = json.load(file)
+            contents = []
+            for name in manifest["files"]:
+                with open(os.path.join(entry, name), 'rb') as file:
+                    contents.append((name, file.read()))
+        except (OSError, ValueError):
+            return None
+        for name, data in contents:
+            write_if_changed(name, data)
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return manifest["console"], manifest["status"]
+
+    def store(self, key, console, status, files):
+        """Guarda os arquivos `files` (caminhos relativos ao diretório atual) na entrada `key`."""
+        entry = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry):
+            return
+        files = [name for name in files if os.path.exists(name)]
+        temporary = f'{entry}.{os.getpid()}.tmp'
+        os.makedirs(temporary, exist_ok=True)
+        for name in files:
+            shutil.copyfile(name, os.path.join(temporary, os.path.basename(name)))
+        manifest = {"status": status, "console": console, "files": [os.path.basename(name) for name in files]}
+        with open(os.path.join(temporary, MANIFEST), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file)
+        try:
+            os.rename(temporary, entry)
+        except OSError:
+            # Outro processo guardou a mesma entrada antes
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o cache caber em max_bytes.
+        Retorna o número de entradas removidas."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.endswith('.tmp') or not os.path.isdir(entry):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, file)) for file in os.listdir(entry))
+            entries.append((os.path.getmtime(entry), size, entry))
+            total += size
+
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
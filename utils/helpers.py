@@ -1,4 +1,53 @@
+import os
 
 def read_file(filename):
     with open(filename, 'r') as file:
         return file.read()
+
+def write_if_changed(filename, content):
+    """Escreve `content` (str ou bytes) em `filename` só se o conteúdo mudou,
+    para não alterar o mtime de arquivos iguais. Retorna True se escreveu."""
+    data = content.encode() if isinstance(content, str) else content
+    try:
+        if os.path.getsize(filename) == len(data):
+            with open(filename, 'rb') as file:
+                if file.read() == data:
+                    return False
+    except OSError:
+        pass
+    with open(filename, 'wb') as file:
+        file.write(data)
+    return True
+
+def write_stream_if_changed(filename, write, chunk_size=1 << 16):
+    """Como write_if_changed, para conteúdo gerado aos poucos: `write(file)`
+    escreve em um arquivo temporário (texto UTF-8, com buffer), que só
+    substitui `filename` se o conteúdo mudou. O conteúdo nunca fica inteiro
+    na memória. Retorna True se substituiu."""
+    temporary = f'{filename}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'w', encoding='utf-8', newline='') as file:
+            write(file)
+        if _same_content(temporary, filename, chunk_size):
+            os.remove(temporary)
+            return False
+        os.replace(temporary, filename)
+        return True
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+def _same_content(first, second, chunk_size):
+    try:
+        if os.path.getsize(first) != os.path.getsize(second):
+            return False
+        with open(first, 'rb') as a, open(second, 'rb') as b:
+            while True:
+                chunk = a.read(chunk_size)
+                if chunk != b.read(chunk_size):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
@@ -0,0 +1,80 @@
+import contextlib
+import json
+import time
+import tracemalloc
+
+PROFILE_MODES = ("json", "cprofile")
+
+def count_ast_nodes(node):
+    """Número de nós (dicionários com "type") da AST."""
+    if isinstance(node, list):
+        return sum(count_ast_nodes(item) for item in node)
+    if isinstance(node, dict):
+        own = 1 if "type" in node else 0
+        return own + sum(count_ast_nodes(value) for value in node.values())
+    return 0
+
+def count_symbols(symbol_table):
+    """Elementos, variáveis e eventos registrados na tabela de símbolos."""
+    events = symbol_table.get("events", {})
+    return (len(symbol_table.get("elements", {})) + len(symbol_table.get("variables", {}))
+            + sum(len(handlers) for handlers in events.values()))
+
+
+class PhaseProfiler:
+    """Mede cada fase do compilador: tempo de parede e pico de memória
+    (tracemalloc, em bytes acima do que já estava alocado no início da fase),
+    além de contadores livres (tokens, nós da AST, bytes gravados...)."""
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        current_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            peak = max(0, tracemalloc.get_traced_memory()[1] - current_before)
+            # Uma fase pode ser medida em vários trechos: os tempos se somam
+            # e vale o maior pico.
+            record = self.phases.setdefault(name, {"wall_ms": 0.0, "peak_bytes": 0})
+            record["wall_ms"] = round(record["wall_ms"] + wall * 1000, 3)
+            record["peak_bytes"] = max(record["peak_bytes"], peak)
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self):
+        return {
+            "phases": self.phases,
+            "total_ms": round(sum(phase["wall_ms"] for phase in self.phases.values()), 3),
+            "counters": self.counters,
+        }
+
+    def dump(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.report(), file, indent=4)
+
+
+class NullProfiler:
+    """Mesma interface de PhaseProfiler, sem medir nada (usado sem --profile)."""
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, name, value):
+        pass